@@ -2,12 +2,22 @@ import streamlit as st
 import pandas as pd
 import os
 import io
-from steps.step1_literature_search import run_literature_search
+from steps.step1_literature_search import iter_literature_search, run_batch_literature_search
+from steps.step1_enrichment import summarize_enrichment
+from steps.step1_snowball import run_snowball
+from steps.step1_saved_searches import list_saved_searches, load_saved_search, run_saved_search, save_search
 from steps.step2_filter_ui import step2_filter_ui
 from steps.step3_pdf_downloader import download_pdfs
-from steps.step4_pdf_summarizer import summarize_pdfs
+from steps.step4_pdf_summarizer import load_pdfs_from_store, summarize_pdfs
 from utils.file_utils import create_zip
 from utils.io_helpers import ensure_dir
+from utils.search_cache import SEARCH_CACHE
+from utils.corpus_store import CORPUS_STORE
+from utils.pdf_store import PDF_STORE
+from utils.pdf_strategies import PDF_STRATEGIES
+from utils.http_client import HTTP_CLIENT
+from utils.records import PaperRecord
+from utils.paged_table import DEFAULT_PAGE_SIZE, page_preview, paged_table
 import io
 import zipfile
 from spellchecker import SpellChecker
@@ -23,7 +33,6 @@ st.title("📚 Literature Survey Automation Platform")
 BASE_OUTPUT_DIR = "outputs"
 SEARCH_DIR = ensure_dir(os.path.join(BASE_OUTPUT_DIR, "search_results"))
 FILTER_DIR = ensure_dir(os.path.join(BASE_OUTPUT_DIR, "filtered_results"))
-PDF_DIR = ensure_dir(os.path.join(BASE_OUTPUT_DIR, "pdfs"))
 SUMMARY_DIR = ensure_dir(os.path.join(BASE_OUTPUT_DIR, "summaries"))
 
 # =====================================================
@@ -120,21 +129,137 @@ search_disabled = error_message is not None
 
 if st.button("🔍 Run Search", disabled=search_disabled):
 
-    with st.spinner("Searching literature sources..."):
-        df = run_literature_search(query, min_year=min_year, max_year=max_year)
+    # Stream merged batches so the table grows as each provider page arrives
+    status_box = st.empty()
+    table_box = st.empty()
+    df = pd.DataFrame()
+
+    for df, status in iter_literature_search(query, min_year=min_year, max_year=max_year):
+        pages = ", ".join(f"{name}: {n} pages" for name, n in status["pages"].items())
+        if status["done"]:
+            status_box.empty()
+            table_box.empty()
+        elif status["provider"] == "corpus":
+            status_box.info(
+                f"{status['corpus_hits']} papers from the local corpus "
+                f"({status['corpus_ms']:.0f} ms) — now asking the literature sources..."
+            )
+            table_box.dataframe(page_preview(df), use_container_width=True, hide_index=True)
+        else:
+            status_box.info(
+                f"Searching literature sources... {len(df)} papers so far ({pages}) — "
+                f"showing the first {min(len(df), DEFAULT_PAGE_SIZE)}"
+            )
+            table_box.dataframe(page_preview(df), use_container_width=True, hide_index=True)
+
+    st.session_state["step1_df"] = df
+    st.session_state["corpus_status"] = {"hits": status["corpus_hits"], "ms": status["corpus_ms"]}
+    st.session_state["search_cache_stats"] = SEARCH_CACHE.stats()
 
-        # 🔧 SAFETY: handle (df, status)
-        if isinstance(df, tuple):
-            df = df[0]
+    path = os.path.join(SEARCH_DIR, "step1_raw_results.xlsx")
+    df.to_excel(path, index=False)
+
+# =====================================================
+# 🔁 Batch Search (several keyword variants at once)
+# =====================================================
+with st.expander("🔁 Batch search — several keyword variants"):
+    batch_text = st.text_area("One query per line", key="batch_queries")
+    batch_queries = [q.strip() for q in batch_text.splitlines() if q.strip()]
+
+    if st.button("🔍 Run Batch Search", disabled=not batch_queries or min_year > max_year):
+        batch_progress = st.progress(0)
+        batch_status = st.empty()
+
+        def report_batch_progress(done, total, provider, batch_query):
+            batch_progress.progress(done / total)
+            batch_status.info(f"Finished {provider} for \"{batch_query}\" ({done}/{total})")
+
+        df = run_batch_literature_search(
+            batch_queries,
+            min_year=min_year,
+            max_year=max_year,
+            progress_callback=report_batch_progress,
+        )
+        batch_status.empty()
 
         st.session_state["step1_df"] = df
+        st.session_state["search_cache_stats"] = SEARCH_CACHE.stats()
+        st.session_state.pop("corpus_status", None)
 
         path = os.path.join(SEARCH_DIR, "step1_raw_results.xlsx")
         df.to_excel(path, index=False)
 
+# =====================================================
+# 💾 Saved Searches (fetch only what is new since last run)
+# =====================================================
+with st.expander("💾 Saved searches — what's new since last run"):
+    save_name = st.text_input("Name for the current query", key="saved_search_name")
+
+    if st.button("💾 Save current query", disabled=search_disabled or not save_name.strip()):
+        save_search(save_name.strip(), query, min_year, max_year)
+        st.success(f"Saved \"{save_name.strip()}\" ({query}, {min_year}–{max_year})")
+
+    saved_names = list_saved_searches()
+    if saved_names:
+        picked = st.selectbox("Saved search", saved_names, key="saved_search_pick")
+        spec = load_saved_search(picked)
+        last_run = spec["runs"][-1]["run_at"] if spec.get("runs") else "never"
+        st.caption(f"Query: {spec['query']} · {spec['min_year']}–{spec['max_year']} · last run: {last_run}")
+
+        if st.button("🔄 Refresh saved search"):
+            with st.spinner("Fetching what's new..."):
+                df, summary = run_saved_search(picked)
+
+            st.session_state["step1_df"] = df
+            st.session_state["search_cache_stats"] = SEARCH_CACHE.stats()
+            st.session_state.pop("corpus_status", None)
+
+            path = os.path.join(SEARCH_DIR, "step1_raw_results.xlsx")
+            df.to_excel(path, index=False)
+
+            st.info(f"{summary['new']} new papers since last run ({summary['total']} total).")
+            if summary["failed"]:
+                st.warning("No response from: " + ", ".join(summary["failed"]) + " — they will be retried next run.")
+
+# =====================================================
+# 🗄️ Local Corpus (every search accumulates here)
+# =====================================================
+with st.expander("🗄️ Local corpus — import earlier results"):
+    st.caption(f"{CORPUS_STORE.stats()['papers']} papers stored locally.")
+    corpus_files = st.file_uploader(
+        "Import step1_raw_results.xlsx files", type=["xlsx"], accept_multiple_files=True, key="corpus_import"
+    )
+    if st.button("📥 Import into corpus", disabled=not corpus_files):
+        inserted = updated = 0
+        for f in corpus_files:
+            n_new, n_updated = CORPUS_STORE.import_excel(f)
+            inserted += n_new
+            updated += n_updated
+        st.success(f"Imported {inserted} new papers, updated {updated}.")
+
 if "step1_df" in st.session_state:
     st.success(f"{len(st.session_state['step1_df'])} papers retrieved.")
-    st.dataframe(st.session_state["step1_df"], use_container_width=True)
+    if "search_cache_stats" in st.session_state:
+        cache_stats = st.session_state["search_cache_stats"]
+        st.caption(
+            f"Search cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"({cache_stats['entries']} pages stored)"
+        )
+    if "corpus_status" in st.session_state:
+        corpus_status = st.session_state["corpus_status"]
+        st.caption(
+            f"Local corpus: {corpus_status['hits']} papers answered offline in {corpus_status['ms']:.0f} ms "
+            f"({CORPUS_STORE.stats()['papers']} papers stored)"
+        )
+    enrichment_report = st.session_state["step1_df"].attrs.get("enrichment_report")
+    if enrichment_report:
+        filled = summarize_enrichment(enrichment_report)
+        if filled:
+            st.caption(
+                f"Enrichment ({len(enrichment_report)} bulk lookups) filled: "
+                + ", ".join(f"{col} × {n}" for col, n in sorted(filled.items()))
+            )
+    paged_table(st.session_state["step1_df"], key="step1")
 
     # 🔧 FIX: Step 1 download must use step1_df, not step2_df
     buffer = io.BytesIO()
@@ -148,6 +273,52 @@ if "step1_df" in st.session_state:
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
 
+    # =====================================================
+    # 🌱 Citation snowballing from the current results
+    # =====================================================
+    with st.expander("🌱 Snowball — expand via references & citations"):
+        sc1, sc2, sc3, sc4 = st.columns(4)
+        with sc1:
+            snow_direction = st.selectbox("Direction", ["both", "backward", "forward"])
+        with sc2:
+            snow_depth = st.number_input("Hops", min_value=1, max_value=3, value=1)
+        with sc3:
+            snow_budget = st.number_input("Max new papers", min_value=50, max_value=20000, value=3000, step=50)
+        with sc4:
+            snow_seeds = st.number_input("Max seeds", min_value=1, max_value=2000, value=200)
+
+        if st.button("🌱 Run Snowball"):
+            snow_status = st.empty()
+
+            def report_snowball_progress(hop, depth, discovered):
+                snow_status.info(f"Hop {hop}/{depth}: {discovered} candidate papers")
+
+            seed_records = [
+                PaperRecord.from_dict(row)
+                for row in st.session_state["step1_df"].to_dict("records")
+            ]
+            st.session_state["snowball_df"] = run_snowball(
+                seed_records,
+                depth=int(snow_depth),
+                direction=snow_direction,
+                budget=int(snow_budget),
+                max_seeds=int(snow_seeds),
+                progress_callback=report_snowball_progress,
+            )
+            snow_status.empty()
+
+        if "snowball_df" in st.session_state:
+            snowball_df = st.session_state["snowball_df"]
+            st.success(f"{len(snowball_df)} new candidate papers (ranked by seed connections).")
+            paged_table(snowball_df, key="snowball")
+
+            if len(snowball_df) and st.button("➕ Add snowball papers to Step 1 results"):
+                st.session_state["step1_df"] = pd.concat(
+                    [st.session_state["step1_df"], snowball_df], ignore_index=True
+                )
+                del st.session_state["snowball_df"]
+                st.rerun()
+
 st.divider()
 
 # =====================================================
@@ -178,7 +349,7 @@ if source_option == "From Step 1":
 # ---------- PREVIEW + COMMIT ----------
 if candidate_df is not None:
     st.subheader("Final Papers Going to Step 3")
-    st.dataframe(candidate_df, use_container_width=True)
+    paged_table(candidate_df, key="step2_final")
     st.success(f"{len(candidate_df)} papers selected.")
 
     col1, col2 = st.columns(2)
@@ -213,17 +384,17 @@ st.header("Step 3 — Download PDFs")
 if "step2_df" not in st.session_state:
     st.warning("No filtered dataset available.")
 else:
-    st.dataframe(st.session_state["step2_df"], use_container_width=True)
+    paged_table(st.session_state["step2_df"], key="step3_input")
 
     if st.button("📥 Download PDFs"):
         with st.spinner("Downloading PDFs..."):
-            pdf_paths, report_df = download_pdfs(
+            pdf_hashes, report_df = download_pdfs(
                 st.session_state["step2_df"],
-                output_dir=PDF_DIR,
+                store=PDF_STORE,
                 report_path="outputs/pdf_download_report.xlsx"
                 
             )
-            st.session_state["downloaded_pdfs"] = pdf_paths
+            st.session_state["downloaded_pdfs"] = pdf_hashes
             st.session_state["download_report_df"] = report_df
 
     # -----------------------------
@@ -232,12 +403,11 @@ else:
     if "downloaded_pdfs" in st.session_state:
 
         st.success(f"{len(st.session_state['downloaded_pdfs'])} PDFs downloaded.")
+        store_stats = PDF_STORE.stats()
+        st.caption(f"PDF store: {store_stats['pdfs']} PDFs · {store_stats['bytes'] / 1e6:.1f} MB")
 
         # ZIP: PDFs + Excel report
-        files_for_zip = {
-            os.path.basename(p): open(p, "rb").read()
-            for p in st.session_state["downloaded_pdfs"]
-        }
+        files_for_zip = load_pdfs_from_store(st.session_state["downloaded_pdfs"])
 
         if "download_report_df" in st.session_state:
             excel_buffer = io.BytesIO()
@@ -271,6 +441,27 @@ else:
 
 
 
+# =====================================================
+# NETWORK STATS (shared HTTP client, steps 1 + 3)
+# =====================================================
+with st.expander("🌐 Network stats"):
+    net_stats = HTTP_CLIENT.stats_frame()
+    if net_stats.empty:
+        st.caption("No requests made yet.")
+    else:
+        st.dataframe(net_stats, use_container_width=True, hide_index=True)
+
+with st.expander("🧭 PDF resolution strategies (per domain)"):
+    strategy_stats = PDF_STRATEGIES.frame()
+    if strategy_stats.empty:
+        st.caption("Nothing learned yet — strategies are recorded as Step 3 downloads PDFs.")
+    else:
+        st.dataframe(strategy_stats, use_container_width=True, hide_index=True)
+        if st.button("Forget learned strategies", key="clear_pdf_strategies"):
+            PDF_STRATEGIES.clear()
+            st.rerun()
+
+
 # =====================================================
 # STEP 4 — PDF → 1-PAGER SUMMARIZATION
 # =====================================================
@@ -286,10 +477,7 @@ pdf_files = None
 
 if pdf_source == "From Step 3 Downloads":
     if "downloaded_pdfs" in st.session_state:
-        pdf_files = {
-            os.path.basename(p): open(p, "rb").read()
-            for p in st.session_state["downloaded_pdfs"]
-        }
+        pdf_files = load_pdfs_from_store(st.session_state["downloaded_pdfs"])
 else:
     uploaded_pdfs = st.file_uploader(
         "Upload one or more PDFs",
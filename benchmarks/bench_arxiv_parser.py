@@ -0,0 +1,119 @@
+"""
+Micro-benchmark: legacy regex Atom parsing vs the streaming pull parser
+used by search_arxiv. "pull" keeps every record (as search_arxiv does);
+"pull streamed" drops each one after use and shows the parser's own
+working memory, which stays flat as the feed grows.
+
+Usage:
+    python benchmarks/bench_arxiv_parser.py                 # synthetic feeds
+    python benchmarks/bench_arxiv_parser.py feed1.xml ...   # recorded feeds
+"""
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from steps.step1_literature_search import arxiv_entry_to_record, parse_arxiv_feed
+
+
+ENTRY_TEMPLATE = """
+  <entry>
+    <id>http://arxiv.org/abs/2101.{n:05d}v2</id>
+    <updated>2021-03-01T00:00:00Z</updated>
+    <published>2021-01-{day:02d}T00:00:00Z</published>
+    <title>Synthetic paper {n} on transformers
+      for LiDAR point clouds</title>
+    <summary>  {summary}
+    </summary>
+    <author><name>Author A{n}</name></author>
+    <author><name>Author B{n}</name></author>
+    <author><name>Author C{n}</name></author>
+    <arxiv:doi>10.1000/synthetic.{n}</arxiv:doi>
+    <arxiv:journal_ref>Journal of Synthetic Results {n} (2021)</arxiv:journal_ref>
+    <link href="http://arxiv.org/abs/2101.{n:05d}v2" rel="alternate" type="text/html"/>
+    <link title="pdf" href="http://arxiv.org/pdf/2101.{n:05d}v2" rel="related" type="application/pdf"/>
+    <arxiv:primary_category term="cs.CV" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.CV" scheme="http://arxiv.org/schemas/atom"/>
+    <category term="cs.LG" scheme="http://arxiv.org/schemas/atom"/>
+  </entry>"""
+
+
+def make_feed(n_entries):
+    summary = " ".join(["We study a synthetic problem in depth."] * 40)
+    entries = "".join(
+        ENTRY_TEMPLATE.format(n=i, day=(i % 28) + 1, summary=summary)
+        for i in range(n_entries)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" '
+        'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+        'xmlns:arxiv="http://arxiv.org/schemas/atom">\n'
+        "  <title>ArXiv Query</title>"
+        f"{entries}\n</feed>\n"
+    )
+
+
+def legacy_regex_parse(body):
+    """The original search_arxiv extraction, kept here for comparison."""
+    records = []
+    for e in re.findall(r"<entry>(.*?)</entry>", body, re.DOTALL):
+        title = re.search(r"<title>(.*?)</title>", e, re.DOTALL)
+        summary = re.search(r"<summary>(.*?)</summary>", e, re.DOTALL)
+        published = re.search(r"<published>(\d{4})-", e)
+        arxiv_id = re.search(r"<id>(.*?)</id>", e)
+        url = arxiv_id.group(1) if arxiv_id else None
+        records.append({
+            "Paper Title": title.group(1).strip() if title else None,
+            "Publication Year": int(published.group(1)) if published else None,
+            "Paper Link": url,
+            "Abstract": re.sub(r"\s+", " ", summary.group(1)) if summary else None,
+        })
+    return records
+
+
+def pull_parse(body):
+    return [arxiv_entry_to_record(e) for e in parse_arxiv_feed(body)]
+
+
+def pull_streamed(body):
+    last = None
+    for last in parse_arxiv_feed(body):
+        pass
+    return [arxiv_entry_to_record(last)] if last else []
+
+
+def measure(fn, body, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn(body)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    fn(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    filled = sum(1 for r in out for _, v in r.items() if v not in (None, ""))
+    return best, peak, len(out), filled
+
+
+def main():
+    if len(sys.argv) > 1:
+        feeds = [(os.path.basename(p), open(p, encoding="utf-8").read()) for p in sys.argv[1:]]
+    else:
+        feeds = [(f"synthetic-{n}", make_feed(n)) for n in (100, 1000, 5000)]
+
+    print(f"{'feed':<18}{'parser':<15}{'entries':>8}{'fields':>9}{'best ms':>10}{'peak KiB':>10}")
+    for name, body in feeds:
+        for label, fn in (("regex", legacy_regex_parse), ("pull", pull_parse), ("pull streamed", pull_streamed)):
+            best, peak, n, filled = measure(fn, body)
+            print(f"{name:<18}{label:<15}{n:>8}{filled:>9}{best * 1000:>10.1f}{peak / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
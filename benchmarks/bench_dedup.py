@@ -0,0 +1,129 @@
+"""
+Benchmark for utils.dedup on synthetic multi-provider corpora.
+
+Each synthetic paper is emitted by up to three "providers": a published
+version with a DOI, an arXiv preprint without DOI (sometimes with a slightly
+different title) and an OpenAlex copy with a PubMed ID. Reports wall time
+plus pairwise precision / recall against the known ground truth.
+
+Usage:
+    python benchmarks/bench_dedup.py [n_papers ...]
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.dedup import DedupEngine
+
+
+COMMON_WORDS = [
+    "deep", "learning", "graph", "neural", "network", "transformer", "lidar",
+    "point", "cloud", "segmentation", "detection", "robust", "efficient",
+    "survey", "review", "attention", "federated", "reinforcement", "policy",
+    "optimization", "sparse", "vision", "language", "model", "generative",
+    "diffusion", "contrastive", "representation", "benchmark", "dataset",
+    "medical", "imaging", "autonomous", "driving", "temporal", "spatial",
+]
+
+
+def make_vocabulary(rng, size=3000):
+    # Real titles mix a few common field terms with many rarer ones
+    rare = {
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 10)))
+        for _ in range(size)
+    }
+    return COMMON_WORDS, sorted(rare)
+
+
+def perturb(title, rng):
+    """Typo / punctuation noise typical of preprint vs published titles."""
+    chars = list(title)
+    for _ in range(rng.randint(0, 2)):
+        i = rng.randrange(len(chars))
+        chars[i] = rng.choice(string.ascii_lowercase)
+    out = "".join(chars)
+    return out.replace(" for ", ": ") if rng.random() < 0.3 else out
+
+
+def make_corpus(n_papers, seed=7):
+    rng = random.Random(seed)
+    common, rare = make_vocabulary(rng)
+    records, truth = [], []
+
+    for pid in range(n_papers):
+        title = " ".join(
+            rng.choice(common) if rng.random() < 0.5 else rng.choice(rare)
+            for _ in range(rng.randint(6, 12))
+        )
+        year = rng.randint(2010, 2024)
+        doi = f"https://doi.org/10.1000/paper.{pid}"
+        arxiv = f"{2000 + pid % 24}.{pid:05d}"
+
+        variants = [{
+            "Paper Title": title.title(), "DOI": doi, "Publication Year": year,
+            "arXiv ID": arxiv if rng.random() < 0.3 else None,
+            "Semantic Scholar ID": f"s2{pid}", "Source": "SemanticScholar",
+        }]
+        if rng.random() < 0.5:
+            variants.append({
+                "Paper Title": perturb(title, rng), "DOI": None,
+                "Publication Year": year - rng.randint(0, 1), "arXiv ID": arxiv,
+                "Source": "arXiv",
+            })
+        if rng.random() < 0.5:
+            variants.append({
+                "Paper Title": title, "DOI": doi if rng.random() < 0.7 else None,
+                "Publication Year": year, "PubMed ID": str(900000 + pid),
+                "OpenAlex ID": f"W{pid}", "Source": "OpenAlex",
+            })
+
+        for v in variants:
+            v.setdefault("Citations Count", 0)
+            records.append(v)
+            truth.append(pid)
+
+    order = list(range(len(records)))
+    rng.shuffle(order)
+    return [records[i] for i in order], [truth[i] for i in order]
+
+
+def pair_counts(labels):
+    groups = {}
+    for i, label in enumerate(labels):
+        groups.setdefault(label, []).append(i)
+    return {frozenset((a, b)) for g in groups.values() for ia, a in enumerate(g) for b in g[ia + 1:]}
+
+
+def main():
+    sizes = [int(x) for x in sys.argv[1:]] or [10_000, 50_000, 100_000]
+
+    print(f"{'papers':>8}{'records':>9}{'clusters':>10}{'seconds':>9}{'precision':>11}{'recall':>8}")
+    for n in sizes:
+        records, truth = make_corpus(n)
+
+        start = time.perf_counter()
+        engine = DedupEngine()
+        engine.add_many(records)
+        clusters = engine.clusters()
+        elapsed = time.perf_counter() - start
+
+        predicted = [0] * len(records)
+        for cid, group in enumerate(clusters):
+            for i in group:
+                predicted[i] = cid
+
+        true_pairs = pair_counts(truth)
+        found_pairs = pair_counts(predicted)
+        hit = len(true_pairs & found_pairs)
+        precision = hit / len(found_pairs) if found_pairs else 1.0
+        recall = hit / len(true_pairs) if true_pairs else 1.0
+
+        print(f"{n:>8}{len(records):>9}{len(clusters):>10}{elapsed:>9.2f}{precision:>11.4f}{recall:>8.4f}")
+
+
+if __name__ == "__main__":
+    main()
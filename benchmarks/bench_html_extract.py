@@ -0,0 +1,118 @@
+"""
+PDF-link extraction from landing pages: the streaming lxml path of
+steps.step3_pdf_downloader.extract_pdf_link against the BeautifulSoup
+implementation it replaced (extract_pdf_link_soup).
+
+Runs over a directory of saved landing pages (*.html / *.htm) when one
+is given, otherwise over synthetic publisher-like pages: a script-heavy
+<head>, long body text and references, with the PDF link in the head
+meta tag, only deep in the body, or nowhere. A few malformed pages (a
+<div> or <span> inside <head>, text before <html>) check that both
+implementations still agree where libxml2 closes <head> early.
+
+Usage:
+    python benchmarks/bench_html_extract.py [landing_pages_dir]
+"""
+import glob
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from steps.step3_pdf_downloader import HTML_MAX_BYTES, extract_pdf_link, extract_pdf_link_soup
+
+
+BASE_URL = "https://publisher.example.org/article/10.1000/xyz"
+
+
+def synthetic_page(body_kb, placement, seed):
+    rng = random.Random(seed)
+    words = ["model", "learning", "data", "results", "method", "analysis", "network", "study", "figure", "table"]
+
+    head = ["<!DOCTYPE html><html lang='en'><head><meta charset='utf-8'><title>Synthetic article</title>"]
+    if placement == "text before html":
+        head.insert(0, "Served by a misconfigured proxy\n")
+    elif placement in ("div in head", "span in head"):
+        tag = placement.split()[0]
+        head.append(f"<{tag} id='consent-banner'>We use cookies</{tag}>")
+    for i in range(60):
+        head.append(f"<meta name='dc.keyword' content='{rng.choice(words)} {i}'>")
+        head.append(f"<link rel='preload' href='/assets/chunk-{i}.js' as='script'>")
+    head.append("<script>" + "var cfg={a:1,b:[1,2,3]};" * 800 + "</script>")
+    if placement != "body" and placement != "none":
+        head.append("<meta name='citation_pdf_url' content='/article/10.1000/xyz.pdf'>")
+    head.append("<style>" + ".c{margin:0;padding:0}" * 400 + "</style></head>")
+
+    body = ["<body><nav>" + "".join(f"<a href='/browse/{i}'>Section {i}</a>" for i in range(200)) + "</nav><main>"]
+    size = 0
+    while size < body_kb * 1024:
+        para = "<p>" + " ".join(rng.choice(words) for _ in range(120)) + f" <a href='#ref{size}'>[{size % 97}]</a></p>"
+        body.append(para)
+        size += len(para)
+    if placement == "body":
+        body.append("<div class='tools'><a class='pdf' href='/article/10.1000/xyz.pdf'>Download PDF</a></div>")
+    elif placement != "none":
+        # Supplementary material: must lose to the head meta tag
+        body.append("<div class='tools'><a href='/article/10.1000/xyz-supplement.pdf'>Supplement</a></div>")
+    body.append("</main><footer>" + "<a href='/about'>About</a>" * 50 + "</footer></body></html>")
+    return "".join(head + body)
+
+
+def load_pages(directory):
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.htm*"))):
+        with open(path, "rb") as f:
+            html = f.read(HTML_MAX_BYTES).decode("utf-8", errors="replace")
+        pages.append((os.path.basename(path), html))
+    return pages
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    if len(sys.argv) > 1:
+        pages = load_pages(sys.argv[1])
+        if not pages:
+            sys.exit(f"No .html / .htm files in {sys.argv[1]}")
+    else:
+        pages = [
+            (f"synthetic {placement} {kb}KB", synthetic_page(kb, placement, seed=kb))
+            for kb in (100, 500, 1500)
+            for placement in ("meta", "body", "none")
+        ] + [
+            (f"synthetic {quirk} 500KB", synthetic_page(500, quirk, seed=1))
+            for quirk in ("div in head", "span in head", "text before html")
+        ]
+
+    print(f"{'page':<28}{'KB':>7}{'soup ms':>10}{'lxml ms':>10}{'speedup':>9}  {'mode':<6} same")
+    total_soup = total_lxml = 0.0
+    agree = 0
+    for name, html in pages:
+        soup_ms, soup_result = timed(lambda: extract_pdf_link_soup(html, BASE_URL))
+        lxml_ms, lxml_result = timed(lambda: extract_pdf_link(html, BASE_URL))
+        total_soup += soup_ms
+        total_lxml += lxml_ms
+        same = soup_result == lxml_result
+        agree += same
+        print(
+            f"{name[:27]:<28}{len(html) / 1024:>7.0f}{soup_ms:>10.1f}{lxml_ms:>10.2f}"
+            f"{soup_ms / max(lxml_ms, 1e-6):>8.1f}x  {str(lxml_result[1]):<6} {'yes' if same else 'NO'}"
+        )
+
+    print(
+        f"\n{len(pages)} pages: soup {total_soup:.0f} ms, lxml {total_lxml:.0f} ms "
+        f"({total_soup / max(total_lxml, 1e-6):.1f}x), same result on {agree}/{len(pages)}"
+    )
+
+
+if __name__ == "__main__":
+    main()
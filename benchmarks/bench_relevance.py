@@ -0,0 +1,78 @@
+"""
+Benchmark for utils.relevance on synthetic result sets.
+
+Titles and abstracts are drawn from a Zipf-distributed vocabulary so
+query terms range from common to rare. Reports the time of the BM25 pass
+alone and of the full blended ranking (BM25 + citations + recency + sort).
+
+Usage:
+    python benchmarks/bench_relevance.py [n_rows ...]
+"""
+import os
+import random
+import string
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.relevance import bm25_scores, document_texts, rank_by_relevance
+
+
+QUERIES = [
+    "lidar point cloud segmentation",
+    "federated learning privacy",
+    "graph neural network molecule property prediction",
+]
+
+
+def make_frame(n_rows, seed=7):
+    rng = random.Random(seed)
+    nrng = np.random.default_rng(seed)
+
+    topical = sorted({w for q in QUERIES for w in q.split()})
+    filler = [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10)))
+        for _ in range(20_000)
+    ]
+    vocab = np.array(topical + filler)
+    weights = 1.0 / np.arange(1, len(vocab) + 1)
+    weights /= weights.sum()
+    # Shuffle so query words land at different frequency ranks
+    nrng.shuffle(vocab)
+
+    titles = [" ".join(nrng.choice(vocab, size=nrng.integers(6, 14), p=weights)) for _ in range(n_rows)]
+    abstracts = [" ".join(nrng.choice(vocab, size=nrng.integers(80, 220), p=weights)) for _ in range(n_rows)]
+
+    return pd.DataFrame({
+        "Paper Title": titles,
+        "Abstract": abstracts,
+        "Citations Count": pd.array(nrng.zipf(1.8, size=n_rows).clip(max=100_000), dtype="Int64"),
+        "Publication Year": pd.array(nrng.integers(1995, 2026, size=n_rows), dtype="Int64"),
+    })
+
+
+def main():
+    sizes = [int(x) for x in sys.argv[1:]] or [10_000, 50_000, 100_000]
+
+    print(f"{'rows':>8}{'query':>52}{'bm25 s':>9}{'ranked s':>10}{'matches':>9}")
+    for n in sizes:
+        df = make_frame(n)
+        texts = document_texts(df)
+        for query in QUERIES:
+            start = time.perf_counter()
+            scores = bm25_scores(texts, query)
+            bm25_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            rank_by_relevance(df, query)
+            ranked_elapsed = time.perf_counter() - start
+
+            print(f"{n:>8}{query:>52}{bm25_elapsed:>9.3f}{ranked_elapsed:>10.3f}{np.count_nonzero(scores):>9}")
+
+
+if __name__ == "__main__":
+    main()
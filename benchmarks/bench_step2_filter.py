@@ -0,0 +1,101 @@
+"""
+Rerun latency of the Step 2 filters against result-set size.
+
+Compares the previous approach (copy, re-parse years, re-apply every
+filter, re-sort on each rerun) with steps.step2_filter_ui.apply_filters:
+cold (first run on a new result set), warm (a row-click rerun with the
+same filters) and one changed filter.
+
+Usage:
+    python benchmarks/bench_step2_filter.py [n_rows ...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from steps.step2_filter_ui import _FILTER_INDEXES, _FINGERPRINTS, apply_filters
+
+
+def make_frame(n_rows, seed=7):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Paper Title": [f"Synthetic paper {i} on topic {i % 997}" for i in range(n_rows)],
+        "DOI": [f"https://doi.org/10.1000/{i}" for i in range(n_rows)],
+        "Publication Year": pd.array(rng.integers(2000, 2026, size=n_rows), dtype="Int64"),
+        "Citations Count": pd.array(rng.zipf(1.8, size=n_rows).clip(max=100_000), dtype="Int64"),
+        "Open Access": pd.array(rng.choice([True, False, None], size=n_rows), dtype="boolean"),
+        "Review": pd.Categorical(rng.choice(["YES", "NO"], size=n_rows, p=[0.1, 0.9])),
+        "Abstract": ["lorem ipsum dolor sit amet " * 40] * n_rows,
+        "Rank Score": rng.random(n_rows),
+        # Nullable like finalize_records output, with a few unclustered rows
+        "Cluster ID": pd.Series(rng.integers(1, n_rows // 3 + 2, size=n_rows), dtype="Int64").where(
+            rng.random(n_rows) > 0.05
+        ),
+    })
+
+
+def naive_filters(df, min_citations, reviews_only, open_access_only, year_selection, top_n):
+    years = pd.to_numeric(df["Publication Year"], errors="coerce").dropna().astype(int).unique()
+    sorted(years, reverse=True)
+
+    filtered_df = df.copy()
+    filtered_df = filtered_df[filtered_df["Citations Count"] >= min_citations]
+    if reviews_only:
+        filtered_df = filtered_df[filtered_df["Review"] == "YES"]
+    if open_access_only:
+        filtered_df = filtered_df[filtered_df["Open Access"].fillna(False).astype(bool)]
+    if year_selection:
+        filtered_df = filtered_df[filtered_df["Publication Year"].isin(year_selection)]
+    if top_n:
+        filtered_df = filtered_df.sort_values("Rank Score", ascending=False).head(top_n)
+    return filtered_df.reset_index(drop=True)
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    sizes = [int(x) for x in sys.argv[1:]] or [5_000, 20_000, 50_000, 100_000]
+    years = list(range(2015, 2026))
+    base = dict(min_citations=5, reviews_only=False, open_access_only=True, year_selection=years, top_n=500)
+    changed = dict(base, reviews_only=True)
+
+    print(f"{'rows':>8}{'naive ms':>10}{'cold ms':>9}{'warm ms':>9}{'1 changed ms':>14}")
+    for n in sizes:
+        df = make_frame(n)
+
+        naive = timed(lambda: naive_filters(df, **base))
+
+        def cold():
+            _FILTER_INDEXES.clear()
+            _FINGERPRINTS.clear()
+            apply_filters(df, **base)
+
+        cold_ms = timed(cold)
+
+        apply_filters(df, **base)
+        warm_ms = timed(lambda: apply_filters(df, **base))
+
+        def one_changed():
+            index = next(iter(_FILTER_INDEXES.values()))
+            index.results.clear()
+            apply_filters(df, **changed)
+
+        changed_ms = timed(one_changed)
+
+        print(f"{n:>8}{naive:>10.1f}{cold_ms:>9.1f}{warm_ms:>9.2f}{changed_ms:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+import json
+import requests
+from utils.dedup import normalize_arxiv_id, normalize_doi
+from utils.http_client import HTTP_CLIENT
+from utils.search_cache import LOOKUP_CACHE
+
+# =========================================================
+# CONFIG
+# =========================================================
+S2_BATCH_URL = "https://api.semanticscholar.org/graph/v1/paper/batch"
+S2_BATCH_SIZE = 500
+S2_BATCH_FIELDS = "title,abstract,year,citationCount,referenceCount,externalIds,url,openAccessPdf,authors,venue,isOpenAccess,fieldsOfStudy"
+
+OPENALEX_WORKS_URL = "https://api.openalex.org/works"
+OPENALEX_BATCH_SIZE = 50
+OPENALEX_ENRICH_SELECT = "id,ids,doi,abstract_inverted_index,open_access,best_oa_location,cited_by_count,referenced_works_count,authorships"
+
+USER_AGENT = "AutoLiteratureSurvey/1.0 (mailto:test@example.com)"
+
+# Marker stored in the cache for IDs the provider does not know
+NOT_FOUND = "null"
+
+
+# =========================================================
+# UTILITIES
+# =========================================================
+def rebuild_abstract(inverted_index):
+    """OpenAlex ships abstracts as {word: [positions]}; rebuild the text."""
+    if not inverted_index:
+        return None
+    positions = [(pos, word) for word, where in inverted_index.items() for pos in where]
+    if not positions:
+        return None
+    positions.sort()
+    return " ".join(word for _, word in positions)
+
+
+def _is_empty(value):
+    return value is None or value == "" or value != value
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _fill(record, column, value, filled):
+    if _is_empty(value):
+        return
+    current = record.get(column)
+    if column == "Citations Count":
+        if (current or 0) < value:
+            record[column] = value
+            filled[column] = filled.get(column, 0) + 1
+        return
+    if _is_empty(current):
+        record[column] = value
+        filled[column] = filled.get(column, 0) + 1
+
+
+def needs_enrichment(record):
+    if record.get("Source") == "arXiv" and not record.get("Citations Count"):
+        return True
+    return any(_is_empty(record.get(col)) for col in ("Abstract", "PDF Link", "Author Names"))
+
+
+# =========================================================
+# SEMANTIC SCHOLAR /paper/batch
+# =========================================================
+def s2_lookup_id(record):
+    """Best identifier for the S2 batch endpoint, in order of reliability."""
+    if record.get("Semantic Scholar ID"):
+        return record.get("Semantic Scholar ID")
+    doi = normalize_doi(record.get("DOI"))
+    if doi:
+        return f"DOI:{doi}"
+    arxiv_id = normalize_arxiv_id(record.get("arXiv ID"))
+    if arxiv_id:
+        return f"ARXIV:{arxiv_id}"
+    if record.get("PubMed ID"):
+        return f"PMID:{record.get('PubMed ID')}"
+    return None
+
+
+def fetch_s2_batch(ids, fields=S2_BATCH_FIELDS, batch_size=S2_BATCH_SIZE):
+    """
+    Resolves IDs through /paper/batch, one POST per `batch_size` IDs.
+    Every answer (including "not found") is cached per ID and field list
+    in LOOKUP_CACHE, so only IDs never seen before go over the network.
+    """
+    found, missing = {}, []
+    bodies = LOOKUP_CACHE.get_many("SemanticScholarPaper", S2_BATCH_URL, [{"id": pid, "fields": fields} for pid in ids])
+    for pid, body in zip(ids, bodies):
+        if body is None:
+            missing.append(pid)
+        elif body != NOT_FOUND:
+            found[pid] = json.loads(body)
+
+    for chunk in _chunks(missing, batch_size):
+        try:
+            r = HTTP_CLIENT.post(
+                S2_BATCH_URL,
+                params={"fields": fields},
+                json={"ids": chunk},
+                headers={"User-Agent": USER_AGENT},
+                timeout=(5, 60),
+            )
+        except requests.exceptions.RequestException:
+            continue
+        if r.status_code != 200:
+            continue
+
+        # The response is aligned with the request; unknown IDs come back as null
+        items = r.json()
+        LOOKUP_CACHE.set_many(
+            "SemanticScholarPaper",
+            S2_BATCH_URL,
+            [({"id": pid, "fields": fields}, json.dumps(item) if item else NOT_FOUND) for pid, item in zip(chunk, items)],
+        )
+        for pid, item in zip(chunk, items):
+            if item:
+                found[pid] = item
+
+    return found
+
+
+def apply_s2_item(record, item, filled):
+    ext = item.get("externalIds") or {}
+    authors = ", ".join(a.get("name") for a in (item.get("authors") or []) if a.get("name")) or None
+    doi = ext.get("DOI")
+
+    _fill(record, "Abstract", item.get("abstract"), filled)
+    _fill(record, "PDF Link", (item.get("openAccessPdf") or {}).get("url"), filled)
+    _fill(record, "Author Names", authors, filled)
+    _fill(record, "DOI", f"https://doi.org/{doi.lower()}" if doi else None, filled)
+    _fill(record, "Open Access", item.get("isOpenAccess"), filled)
+    _fill(record, "Citations Count", item.get("citationCount"), filled)
+    _fill(record, "References", item.get("referenceCount"), filled)
+    _fill(record, "PubMed ID", ext.get("PubMed"), filled)
+    _fill(record, "PMC ID", ext.get("PubMedCentral"), filled)
+    _fill(record, "arXiv ID", ext.get("ArXiv"), filled)
+    _fill(record, "Semantic Scholar ID", item.get("paperId"), filled)
+
+
+# =========================================================
+# OPENALEX filter=doi:a|b|c
+# =========================================================
+def fetch_openalex_by_doi(dois):
+    found, missing = {}, []
+    bodies = LOOKUP_CACHE.get_many(
+        "OpenAlexWork", OPENALEX_WORKS_URL, [{"doi": doi, "select": OPENALEX_ENRICH_SELECT} for doi in dois]
+    )
+    for doi, body in zip(dois, bodies):
+        if body is None:
+            missing.append(doi)
+        elif body != NOT_FOUND:
+            found[doi] = json.loads(body)
+
+    for chunk in _chunks(missing, OPENALEX_BATCH_SIZE):
+        try:
+            r = HTTP_CLIENT.get(
+                OPENALEX_WORKS_URL,
+                params={
+                    "filter": "doi:" + "|".join(chunk),
+                    "select": OPENALEX_ENRICH_SELECT,
+                    "per-page": OPENALEX_BATCH_SIZE,
+                },
+                headers={"User-Agent": USER_AGENT},
+                timeout=(5, 30),
+            )
+        except requests.exceptions.RequestException:
+            continue
+        if r.status_code != 200:
+            continue
+
+        by_doi = {normalize_doi(item.get("doi")): item for item in r.json().get("results", [])}
+        LOOKUP_CACHE.set_many(
+            "OpenAlexWork",
+            OPENALEX_WORKS_URL,
+            [
+                ({"doi": doi, "select": OPENALEX_ENRICH_SELECT}, json.dumps(by_doi[doi]) if by_doi.get(doi) else NOT_FOUND)
+                for doi in chunk
+            ],
+        )
+        for doi in chunk:
+            if by_doi.get(doi):
+                found[doi] = by_doi[doi]
+
+    return found
+
+
+def apply_openalex_item(record, item, filled):
+    ids = item.get("ids") or {}
+    authors = ", ".join(
+        a.get("author", {}).get("display_name")
+        for a in (item.get("authorships") or [])
+        if a.get("author", {}).get("display_name")
+    ) or None
+
+    _fill(record, "Abstract", rebuild_abstract(item.get("abstract_inverted_index")), filled)
+    _fill(record, "PDF Link", (item.get("best_oa_location") or {}).get("pdf_url"), filled)
+    _fill(record, "Author Names", authors, filled)
+    _fill(record, "Open Access", (item.get("open_access") or {}).get("is_oa"), filled)
+    _fill(record, "Citations Count", item.get("cited_by_count"), filled)
+    _fill(record, "References", item.get("referenced_works_count"), filled)
+    _fill(record, "PubMed ID", (ids.get("pmid") or "").rstrip("/").split("/")[-1] or None, filled)
+    _fill(record, "PMC ID", (ids.get("pmcid") or "").rstrip("/").split("/")[-1] or None, filled)
+    _fill(record, "OpenAlex ID", (item.get("id") or "").split("/")[-1] or None, filled)
+
+
+# =========================================================
+# PUBLIC ENTRYPOINT
+# =========================================================
+def enrich_records(records):
+    """
+    Fills missing abstracts, PDF links, authors, citation counts and IDs on
+    merged records using bulk lookups: Semantic Scholar /paper/batch first,
+    then OpenAlex filter=doi:a|b|c for whatever is still missing.
+    Records are updated in place; returns a report with one entry per
+    batch stating how many fields it filled.
+    """
+    report = []
+
+    # 1️⃣ Semantic Scholar batch
+    targets = {}
+    for r in records:
+        # A record that came from S2 already holds everything /paper/batch
+        # would return; its gaps go straight to the OpenAlex lookup
+        if needs_enrichment(r) and r.get("Source") != "SemanticScholar":
+            pid = s2_lookup_id(r)
+            if pid:
+                targets.setdefault(pid, []).append(r)
+
+    ids = list(targets)
+    for batch_no, chunk in enumerate(_chunks(ids, S2_BATCH_SIZE), start=1):
+        found = fetch_s2_batch(chunk)
+        filled = {}
+        for pid, item in found.items():
+            for r in targets[pid]:
+                apply_s2_item(r, item, filled)
+        report.append({
+            "provider": "SemanticScholar",
+            "batch": batch_no,
+            "ids": len(chunk),
+            "found": len(found),
+            "filled": filled,
+        })
+
+    # 2️⃣ OpenAlex by DOI
+    targets = {}
+    for r in records:
+        if needs_enrichment(r):
+            doi = normalize_doi(r.get("DOI"))
+            if doi and not doi.startswith("10.48550/"):
+                targets.setdefault(doi, []).append(r)
+
+    dois = list(targets)
+    for batch_no, chunk in enumerate(_chunks(dois, OPENALEX_BATCH_SIZE), start=1):
+        found = fetch_openalex_by_doi(chunk)
+        filled = {}
+        for doi, item in found.items():
+            for r in targets[doi]:
+                apply_openalex_item(r, item, filled)
+        report.append({
+            "provider": "OpenAlex",
+            "batch": batch_no,
+            "ids": len(chunk),
+            "found": len(found),
+            "filled": filled,
+        })
+
+    return report
+
+
+def summarize_enrichment(report):
+    totals = {}
+    for entry in report:
+        for col, n in entry["filled"].items():
+            totals[col] = totals.get(col, 0) + n
+    return totals
@@ -1,24 +1,45 @@
+import json
 import requests
-import pandas as pd
-import time
 import re
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from xml.etree import ElementTree as ET
+from steps.step1_enrichment import enrich_records, rebuild_abstract
+from utils.clustering import cluster_papers
+from utils.corpus_store import CORPUS_STORE
+from utils.dedup import DedupEngine, merge_cluster
+from utils.http_client import HTTP_CLIENT
+from utils.records import PaperRecord, records_to_dataframe
+from utils.relevance import rank_by_relevance
+from utils.search_cache import SEARCH_CACHE
 
 # =========================================================
 # CONFIG
 # =========================================================
-SEMANTIC_PAGE_SIZE = 50
+SEMANTIC_PAGE_SIZE = 100
 SEMANTIC_MAX_RESULTS = 500
+SEMANTIC_FIELDS = "title,abstract,year,citationCount,externalIds,url,openAccessPdf,authors,venue,isOpenAccess,referenceCount,fieldsOfStudy"
+
+OPENALEX_PAGE_SIZE = 200
 OPENALEX_MAX_RESULTS = 500
+# Only the attributes we map into a record, not the full work object
+OPENALEX_SELECT = "id,ids,doi,title,publication_year,type,primary_location,best_oa_location,authorships,open_access,cited_by_count,referenced_works_count,abstract_inverted_index"
+
+ARXIV_PAGE_SIZE = 100
 ARXIV_MAX_RESULTS = 300
 
-REQUEST_DELAY = 1.0
-ARXIV_DELAY = 3.0
+# Per-host request spacing lives in utils.rate_limiter.HOST_MIN_INTERVALS
+BATCH_MAX_WORKERS = 6
 
 USER_AGENT = "AutoLiteratureSurvey/1.0 (mailto:test@example.com)"
 
+
+class ProviderError(RuntimeError):
+    """A provider stopped answering before its results were exhausted."""
+
 # =========================================================
 # UTILITIES
 # =========================================================
@@ -38,128 +59,164 @@ def year_is_valid(year, min_year, max_year):
     return year is None or (min_year <= year <= max_year)
 
 
+def arxiv_date_range(min_year, max_year):
+    return f"submittedDate:[{min_year}01010000 TO {max_year}12312359]"
+
+
+def arxiv_updated_since(since):
+    return f"lastUpdatedDate:[{since:%Y%m%d}0000 TO 299912312359]"
+
+
 def is_review_paper(title):
     return "YES" if title and "review" in title.lower() else "NO"
 
 
-def get_retry_session():
-    session = requests.Session()
-    retries = Retry(
-        total=4,
-        connect=4,
-        read=4,
-        backoff_factor=2,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET"],
-        raise_on_status=False,
-    )
-    adapter = HTTPAdapter(max_retries=retries)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-    return session
+def fetch_page(provider, url, params, timeout):
+    """
+    GET one provider page through the on-disk search cache and the
+    shared HTTP client, which applies the per-host rate limiter.
+    Cache hits never touch the network or the limiter.
+    Returns (status_code, body_text, from_cache).
+    """
+    body = SEARCH_CACHE.get(provider, url, params)
+    if body is not None:
+        return 200, body, True
+
+    r = HTTP_CLIENT.get(url, params=params, headers={"User-Agent": USER_AGENT}, timeout=timeout)
+    if r.status_code == 200:
+        SEARCH_CACHE.set(provider, url, params, r.text)
+    return r.status_code, r.text, False
 
 
 # =========================================================
 # SEMANTIC SCHOLAR
 # =========================================================
-def search_semantic_scholar(keyword, min_year, max_year):
+def s2_item_to_record(item):
+    year = item.get("year")
+    title = item.get("title")
+    review = is_review_paper(title)
+
+    authors = ", ".join(
+        a.get("name") for a in (item.get("authors") or []) if a.get("name")
+    ) or None
+
+    ext = item.get("externalIds") or {}
+
+    return PaperRecord(
+        title=title,
+        link=item.get("url"),
+        year=year,
+        pub_type=None,
+        venue=item.get("venue"),
+        authors=authors,
+        doi=normalize_doi_to_url(ext.get("DOI")),
+        pdf_link=(item.get("openAccessPdf") or {}).get("url"),
+        open_access=item.get("isOpenAccess"),
+        citations=item.get("citationCount") or 0,
+        pubmed_id=ext.get("PubMed"),
+        pmc_id=ext.get("PubMedCentral"),
+        references=item.get("referenceCount"),
+        arxiv_id=ext.get("ArXiv"),
+        s2_id=item.get("paperId"),
+        openalex_id=None,
+        categories=", ".join(item.get("fieldsOfStudy") or []) or None,
+        source="SemanticScholar",
+        abstract=item.get("abstract"),
+        review=review,
+        preprint="NO",
+        arxiv_used="NO",
+    )
+
+
+def iter_semantic_scholar_pages(keyword, min_year, max_year, since=None, strict=False):
     url = "https://api.semanticscholar.org/graph/v1/paper/search"
-    results, offset = [], 0
-    session = get_retry_session()
+    offset = 0
 
     while offset < SEMANTIC_MAX_RESULTS:
+        params = {
+            "query": keyword,
+            "fields": SEMANTIC_FIELDS,
+            "year": f"{min_year}-{max_year}",
+            "limit": min(SEMANTIC_PAGE_SIZE, SEMANTIC_MAX_RESULTS - offset),
+            "offset": offset,
+        }
+        if since:
+            # Open-ended range: everything published on or after `since`
+            params["publicationDateOrYear"] = f"{since:%Y-%m-%d}:"
         try:
-            r = session.get(
-                url,
-                params={
-                    "query": keyword,
-                    "fields": "title,abstract,year,citationCount,externalIds,url,openAccessPdf,authors,venue,isOpenAccess,referenceCount",
-                    "limit": SEMANTIC_PAGE_SIZE,
-                    "offset": offset,
-                },
-                headers={"User-Agent": USER_AGENT},
-                timeout=(5, 15),
-            )
-        except requests.exceptions.RequestException:
+            status, body, _ = fetch_page("SemanticScholar", url, params, (5, 15))
+        except requests.exceptions.RequestException as e:
+            if strict:
+                raise ProviderError(f"SemanticScholar: {e}") from e
             break
 
-        if r.status_code == 429:
-            time.sleep(5)
-            continue
-
-        if r.status_code != 200:
+        # Throttled responses were already retried with bounded backoff by
+        # the shared client; anything still non-200 ends the pagination
+        if status != 200:
+            if strict:
+                raise ProviderError(f"SemanticScholar: HTTP {status}")
             break
 
-        data = r.json().get("data", [])
+        payload = json.loads(body)
+        data = payload.get("data", [])
         if not data:
             break
 
+        results = []
         for item in data:
             year = item.get("year")
             if not year_is_valid(year, min_year, max_year):
                 continue
 
-            title = item.get("title")
-            review = is_review_paper(title)
+            record = s2_item_to_record(item)
+            record.matched_queries = keyword
+            results.append(record)
 
-            authors = ", ".join(
-                a.get("name") for a in (item.get("authors") or []) if a.get("name")
-            ) or None
+        yield results
 
-            ext = item.get("externalIds") or {}
-
-            results.append({
-                "Paper Title": title,
-                "Paper Link": item.get("url"),
-                "Publication Year": year,
-                "Publication Type": None,
-                "Publication Title": item.get("venue"),
-                "Author Names": authors,
-                "DOI": normalize_doi_to_url(ext.get("DOI")),
-                "PDF Link": (item.get("openAccessPdf") or {}).get("url"),
-                "Open Access": item.get("isOpenAccess"),
-                "Citations Count": item.get("citationCount") or 0,
-                "PubMed ID": ext.get("PubMed"),
-                "PMC ID": ext.get("PubMedCentral"),
-                "References": item.get("referenceCount"),
-                "arXiv ID": ext.get("ArXiv"),
-                "Source": "SemanticScholar",
-                "Abstract": item.get("abstract"),
-                "Review": review,
-                "Preprint": "NO",
-                "arXiv_used": "NO",
-            })
-
-        offset += SEMANTIC_PAGE_SIZE
-        time.sleep(REQUEST_DELAY)
-
-    return results
+        offset += len(data)
+        # Stop once the server says there is nothing left to page through
+        if offset >= (payload.get("total") or 0) or payload.get("next") is None:
+            break
+
+
+def search_semantic_scholar(keyword, min_year, max_year):
+    return [r for page in iter_semantic_scholar_pages(keyword, min_year, max_year) for r in page]
 
 
 # =========================================================
 # OPENALEX
 # =========================================================
-def search_openalex(keyword, min_year, max_year):
+def iter_openalex_pages(keyword, min_year, max_year, since=None, strict=False):
     url = "https://api.openalex.org/works"
-    results, cursor = [], "*"
-    session = get_retry_session()
-
-    while len(results) < OPENALEX_MAX_RESULTS:
+    total, cursor = 0, "*"
+
+    while total < OPENALEX_MAX_RESULTS:
+        filters = f"publication_year:{min_year}-{max_year}"
+        if since:
+            filters += f",from_publication_date:{since:%Y-%m-%d}"
+        params = {
+            "search": keyword,
+            "filter": filters,
+            "select": OPENALEX_SELECT,
+            "per-page": min(OPENALEX_PAGE_SIZE, OPENALEX_MAX_RESULTS - total),
+            "cursor": cursor,
+        }
         try:
-            r = session.get(
-                url,
-                params={"search": keyword, "per-page": 50, "cursor": cursor},
-                headers={"User-Agent": USER_AGENT},
-                timeout=(5, 15),
-            )
-        except requests.exceptions.RequestException:
+            status, body, _ = fetch_page("OpenAlex", url, params, (5, 15))
+        except requests.exceptions.RequestException as e:
+            if strict:
+                raise ProviderError(f"OpenAlex: {e}") from e
             break
 
-        if r.status_code != 200:
+        if status != 200:
+            if strict:
+                raise ProviderError(f"OpenAlex: HTTP {status}")
             break
 
-        data = r.json()
+        data = json.loads(body)
 
+        results = []
         for item in data.get("results", []):
             year = item.get("publication_year")
             if not year_is_valid(year, min_year, max_year):
@@ -175,138 +232,466 @@ def search_openalex(keyword, min_year, max_year):
             ) or None
 
             source = (item.get("primary_location") or {}).get("source") or {}
-
-            results.append({
-                "Paper Title": title,
-                "Paper Link": item.get("id"),
-                "Publication Year": year,
-                "Publication Type": item.get("type"),
-                "Publication Title": source.get("display_name"),
-                "Author Names": authors,
-                "DOI": normalize_doi_to_url(item.get("doi")),
-                "PDF Link": None,
-                "Open Access": (item.get("open_access") or {}).get("is_oa"),
-                "Citations Count": item.get("cited_by_count") or 0,
-                "PubMed ID": None,
-                "PMC ID": None,
-                "References": item.get("referenced_works_count"),
-                "arXiv ID": None,
-                "Source": "OpenAlex",
-                "Abstract": None,
-                "Review": review,
-                "Preprint": "NO",
-                "arXiv_used": "NO",
-            })
+            ids = item.get("ids") or {}
+
+            results.append(PaperRecord(
+                title=title,
+                link=item.get("id"),
+                year=year,
+                pub_type=item.get("type"),
+                venue=source.get("display_name"),
+                authors=authors,
+                doi=normalize_doi_to_url(item.get("doi")),
+                pdf_link=(item.get("best_oa_location") or {}).get("pdf_url"),
+                open_access=(item.get("open_access") or {}).get("is_oa"),
+                citations=item.get("cited_by_count") or 0,
+                pubmed_id=(ids.get("pmid") or "").rstrip("/").split("/")[-1] or None,
+                pmc_id=(ids.get("pmcid") or "").rstrip("/").split("/")[-1] or None,
+                references=item.get("referenced_works_count"),
+                arxiv_id=None,
+                s2_id=None,
+                openalex_id=(item.get("id") or "").split("/")[-1] or None,
+                categories=None,
+                source="OpenAlex",
+                abstract=rebuild_abstract(item.get("abstract_inverted_index")),
+                review=review,
+                preprint="NO",
+                arxiv_used="NO",
+                matched_queries=keyword,
+            ))
+
+        total += len(results)
+        yield results
 
         cursor = (data.get("meta") or {}).get("next_cursor")
-        if not cursor:
+        if not cursor or not data.get("results"):
             break
 
-        time.sleep(REQUEST_DELAY)
 
-    return results
+def search_openalex(keyword, min_year, max_year):
+    return [r for page in iter_openalex_pages(keyword, min_year, max_year) for r in page]
 
 
 # =========================================================
 # ARXIV (HARDENED)
 # =========================================================
-def search_arxiv(keyword, min_year, max_year):
+ATOM_NS = "{http://www.w3.org/2005/Atom}"
+ARXIV_NS = "{http://arxiv.org/schemas/atom}"
+
+
+ARXIV_TEXT_FIELDS = {
+    ATOM_NS + "id": "id",
+    ATOM_NS + "title": "title",
+    ATOM_NS + "summary": "summary",
+    ATOM_NS + "published": "published",
+    ATOM_NS + "updated": "updated",
+    ARXIV_NS + "doi": "doi",
+    ARXIV_NS + "journal_ref": "journal_ref",
+    ARXIV_NS + "comment": "comment",
+}
+ARXIV_FEED_CHUNK = 64 * 1024
+
+
+def _clean_text(text):
+    return " ".join(text.split()) if text else None
+
+
+def _arxiv_entry(elem):
+    """Maps one <entry> element in a single pass over its children."""
+    entry = dict.fromkeys(list(ARXIV_TEXT_FIELDS.values()) + ["primary_category", "pdf_link"])
+    entry["authors"], entry["categories"] = [], []
+
+    for child in elem:
+        tag = child.tag
+        field = ARXIV_TEXT_FIELDS.get(tag)
+        if field:
+            if entry[field] is None:
+                entry[field] = _clean_text(child.text)
+        elif tag == ATOM_NS + "author":
+            name = _clean_text(child.findtext(ATOM_NS + "name"))
+            if name:
+                entry["authors"].append(name)
+        elif tag == ATOM_NS + "category":
+            if child.get("term"):
+                entry["categories"].append(child.get("term"))
+        elif tag == ATOM_NS + "link":
+            if entry["pdf_link"] is None and (child.get("title") == "pdf" or child.get("type") == "application/pdf"):
+                entry["pdf_link"] = child.get("href")
+        elif tag == ARXIV_NS + "primary_category":
+            entry["primary_category"] = child.get("term")
+    return entry
+
+
+def parse_arxiv_feed(body):
+    """
+    Incrementally parses an arXiv Atom feed and yields one dict per entry.
+    The body is fed to a pull parser in chunks and the root is emptied
+    after every <entry>, so memory stays bounded by a single entry rather
+    than the whole document tree.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    entry_tag = ATOM_NS + "entry"
+    root = None
+
+    for i in range(0, len(body), ARXIV_FEED_CHUNK):
+        parser.feed(body[i:i + ARXIV_FEED_CHUNK])
+        for event, elem in parser.read_events():
+            if root is None:
+                root = elem
+            elif event == "end" and elem.tag == entry_tag:
+                yield _arxiv_entry(elem)
+                root.clear()
+    parser.close()
+
+
+def arxiv_entry_to_record(entry):
+    url = entry["id"]
+    published = entry["published"]
+    year = int(published[:4]) if published and published[:4].isdigit() else None
+
+    # ".../abs/2101.00001v2" -> "2101.00001" so it lines up with S2 externalIds
+    arxiv_id = re.sub(r"v\d+$", "", url.split("/abs/")[-1]) if url else None
+    doi = entry["doi"]
+    title = entry["title"]
+
+    return PaperRecord(
+        title=title,
+        link=url,
+        year=year,
+        pub_type="article" if entry["journal_ref"] or doi else "preprint",
+        venue=entry["journal_ref"] or "arXiv",
+        authors=", ".join(entry["authors"]) or None,
+        doi=normalize_doi_to_url(doi),
+        pdf_link=entry["pdf_link"] or (url.replace("/abs/", "/pdf/") if url else None),
+        open_access=True,
+        citations=0,
+        pubmed_id=None,
+        pmc_id=None,
+        references=None,
+        arxiv_id=arxiv_id,
+        s2_id=None,
+        openalex_id=None,
+        categories=", ".join(entry["categories"]) or entry["primary_category"],
+        source="arXiv",
+        abstract=entry["summary"],
+        review=is_review_paper(title),
+        preprint="YES",
+        arxiv_used="YES",
+    )
+
+
+def iter_arxiv_pages(keyword, min_year, max_year, since=None, strict=False):
     base_url = "https://export.arxiv.org/api/query"
-    results, start = [], 0
-    session = get_retry_session()
+    start = 0
 
     while start < ARXIV_MAX_RESULTS:
+        page_size = min(ARXIV_PAGE_SIZE, ARXIV_MAX_RESULTS - start)
+        search_query = f"all:{keyword} AND {arxiv_date_range(min_year, max_year)}"
+        if since:
+            search_query += f" AND {arxiv_updated_since(since)}"
+        params = {
+            "search_query": search_query,
+            "start": start,
+            "max_results": page_size,
+        }
         try:
-            r = session.get(
-                base_url,
-                params={"search_query": f"all:{keyword}", "start": start, "max_results": 50},
-                headers={"User-Agent": USER_AGENT},
-                timeout=(5, 10),
-            )
-        except requests.exceptions.RequestException:
+            status, body, _ = fetch_page("arXiv", base_url, params, (5, 10))
+        except requests.exceptions.RequestException as e:
+            if strict:
+                raise ProviderError(f"arXiv: {e}") from e
             break
 
-        if r.status_code != 200:
+        if status != 200:
+            if strict:
+                raise ProviderError(f"arXiv: HTTP {status}")
             break
 
-        entries = re.findall(r"<entry>(.*?)</entry>", r.text, re.DOTALL)
+        try:
+            entries = list(parse_arxiv_feed(body))
+        except ET.ParseError as e:
+            if strict:
+                raise ProviderError(f"arXiv: malformed feed ({e})") from e
+            break
         if not entries:
             break
 
-        for e in entries:
-            title = re.search(r"<title>(.*?)</title>", e, re.DOTALL)
-            summary = re.search(r"<summary>(.*?)</summary>", e, re.DOTALL)
-            published = re.search(r"<published>(\d{4})-", e)
-            arxiv_id = re.search(r"<id>(.*?)</id>", e)
-
-            year = int(published.group(1)) if published else None
-            if not year_is_valid(year, min_year, max_year):
+        results = []
+        for entry in entries:
+            record = arxiv_entry_to_record(entry)
+            if not year_is_valid(record["Publication Year"], min_year, max_year):
                 continue
+            record.matched_queries = keyword
+            results.append(record)
+
+        yield results
 
-            url = arxiv_id.group(1) if arxiv_id else None
-
-            results.append({
-                "Paper Title": title.group(1).strip() if title else None,
-                "Paper Link": url,
-                "Publication Year": year,
-                "Publication Type": "preprint",
-                "Publication Title": "arXiv",
-                "Author Names": None,
-                "DOI": None,
-                "PDF Link": url.replace("/abs/", "/pdf/") if url else None,
-                "Open Access": True,
-                "Citations Count": 0,
-                "PubMed ID": None,
-                "PMC ID": None,
-                "References": None,
-                "arXiv ID": url.split("/")[-1] if url else None,
-                "Source": "arXiv",
-                "Abstract": re.sub(r"\s+", " ", summary.group(1)) if summary else None,
-                "Review": "NO",
-                "Preprint": "YES",
-                "arXiv_used": "YES",
-            })
-
-        start += 50
-        time.sleep(ARXIV_DELAY)
-
-    return results
+        start += len(entries)
+        # A short page means the feed is exhausted
+        if len(entries) < page_size:
+            break
+
+
+def search_arxiv(keyword, min_year, max_year):
+    return [r for page in iter_arxiv_pages(keyword, min_year, max_year) for r in page]
 
 
 # =========================================================
 # DEDUPLICATION
 # =========================================================
+class MergeState:
+    """
+    Running dedup state so records can be merged page by page.
+    Clustering is delegated to utils.dedup.DedupEngine.
+    """
+
+    def __init__(self):
+        self.engine = DedupEngine()
+
+    def add(self, records):
+        self.engine.add_many(records)
+
+    def records(self):
+        engine = self.engine
+        return [
+            merge_cluster([engine.records[i] for i in group])
+            for group in engine.clusters()
+        ]
+
+
 def merge_records(records):
-    merged = {}
-    for r in records:
-        key = r["DOI"] or normalize_title(r["Paper Title"])
-        if not key:
-            continue
-
-        if key not in merged:
-            merged[key] = r
+    state = MergeState()
+    state.add(records)
+    return state.records()
+
+
+def build_results_df(records, enrichment_report=None, extra_columns=None, query=None):
+    """
+    Results frame, ranked by relevance to `query` blended with citations
+    and recency when a query is given, by citations otherwise.
+    """
+    df = records_to_dataframe(records)
+    # Per-record columns outside the schema, aligned with `records`
+    for col, values in (extra_columns or {}).items():
+        df[col] = values
+    if not df.empty:
+        df["Citations Count"] = df["Citations Count"].fillna(0)
+        if query:
+            df = rank_by_relevance(df, query)
         else:
-            m = merged[key]
-            m["Citations Count"] = max(m["Citations Count"], r["Citations Count"])
-            for col in m:
-                m[col] = m[col] or r[col]
-            if r["Preprint"] == "YES":
-                m["Preprint"] = "YES"
-                m["arXiv_used"] = "YES"
+            df = df.sort_values("Citations Count", ascending=False).reset_index(drop=True)
+    if enrichment_report is not None:
+        df.attrs["enrichment_report"] = enrichment_report
+    return df
+
 
-    return list(merged.values())
+def finalize_records(records, enrich=True, query=None):
+    """
+    Runs the bulk enrichment stage on merged records, stores them in the
+    local corpus, builds the frame and clusters it.
+    """
+    report = enrich_records(records) if enrich and records else None
+    CORPUS_STORE.upsert(records)
+    return cluster_papers(build_results_df(records, report, query=query))
 
 
 # =========================================================
-# PUBLIC ENTRYPOINT (UI CALLS THIS)
+# LOCAL CORPUS
 # =========================================================
-def run_literature_search(keyword, min_year, max_year):
-    ss = search_semantic_scholar(keyword, min_year, max_year)
-    oa = search_openalex(keyword, min_year, max_year)
-    ax = search_arxiv(keyword, min_year, max_year)
+def search_corpus(keyword, min_year, max_year):
+    """Papers already in the local corpus for this query, tagged with it."""
+    records = CORPUS_STORE.search(keyword, min_year, max_year)
+    for record in records:
+        # Matched Queries reflects this search, not the ones that stored the paper
+        record.matched_queries = keyword
+    return records
 
-    df = pd.DataFrame(merge_records(ss + oa + ax))
-    if not df.empty:
-        df["Citations Count"] = pd.to_numeric(df["Citations Count"], errors="coerce").fillna(0)
-        df = df.sort_values("Citations Count", ascending=False).reset_index(drop=True)
-    return df
+
+# =========================================================
+# CONCURRENT FAN-OUT
+# =========================================================
+# Each provider pages on its own thread behind its own host rate limit,
+# so running them on separate threads bounds wall time by the slowest one.
+PROVIDERS = {
+    "SemanticScholar": search_semantic_scholar,
+    "OpenAlex": search_openalex,
+    "arXiv": search_arxiv,
+}
+
+PAGE_ITERATORS = {
+    "SemanticScholar": iter_semantic_scholar_pages,
+    "OpenAlex": iter_openalex_pages,
+    "arXiv": iter_arxiv_pages,
+}
+
+
+def run_providers_concurrently(keyword, min_year, max_year):
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(PROVIDERS)) as pool:
+        futures = {
+            pool.submit(fn, keyword, min_year, max_year): name
+            for name, fn in PROVIDERS.items()
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception:
+                # A failing provider must not sink the others
+                results[name] = []
+
+    # Merge in a fixed provider order so duplicates resolve the same way
+    # regardless of which provider finished first
+    records = []
+    for name in PROVIDERS:
+        records.extend(results.get(name, []))
+    return records
+
+
+def run_providers_sequentially(keyword, min_year, max_year):
+    records = []
+    for fn in PROVIDERS.values():
+        records.extend(fn(keyword, min_year, max_year))
+    return records
+
+
+# =========================================================
+# BATCH SEARCH
+# =========================================================
+def _collect_pages(fn, keyword, min_year, max_year):
+    return [r for page in fn(keyword, min_year, max_year) for r in page]
+
+
+def run_batch_literature_search(queries, min_year, max_year, max_workers=BATCH_MAX_WORKERS, progress_callback=None, enrich=True):
+    """
+    Runs every provider x query pager through one worker pool on top of
+    the shared HTTP client's connection pools. The process-wide host rate
+    limiter keeps each API at its politeness rate no matter how many queries
+    run at once. Results are
+    deduplicated across the whole batch; "Matched Queries" lists every query
+    that returned a paper.
+
+    progress_callback(done, total, provider, query) is called from the
+    caller's thread as each provider x query job finishes.
+    """
+    queries = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+    jobs = [(query, name) for query in queries for name in PAGE_ITERATORS]
+    results = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_collect_pages, PAGE_ITERATORS[name], query, min_year, max_year): (query, name)
+            for query, name in jobs
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            query, name = futures[future]
+            try:
+                results[(query, name)] = future.result()
+            except Exception:
+                results[(query, name)] = []
+            if progress_callback:
+                progress_callback(done, len(jobs), name, query)
+
+    # Corpus hits first, then job order, so duplicates resolve the same
+    # way on every run
+    state = MergeState()
+    for query in queries:
+        state.add(search_corpus(query, min_year, max_year))
+    for job in jobs:
+        state.add(results.get(job, []))
+    return finalize_records(state.records(), enrich=enrich, query=" ".join(queries))
+
+
+# =========================================================
+# STREAMING SEARCH
+# =========================================================
+def _pump_pages(name, pages, out_queue, stop_event):
+    try:
+        for page in pages:
+            if stop_event.is_set():
+                break
+            out_queue.put((name, page))
+    except Exception:
+        pass
+    finally:
+        # None marks the provider as finished
+        out_queue.put((name, None))
+
+
+def _snapshot(status):
+    return {**status, "pages": dict(status["pages"]), "finished": list(status["finished"])}
+
+
+def iter_literature_search(keyword, min_year, max_year, enrich=True, use_corpus=True):
+    """
+    Yields (df, status) after every provider page. df is the merged,
+    deduplicated result set so far; status reports pages received per
+    provider and which providers have finished. The final (done) frame
+    has also been through the bulk enrichment stage.
+
+    The first frame comes from the local corpus before any provider is
+    contacted; provider pages then only add what the corpus is missing.
+    """
+    out_queue = queue.Queue()
+    stop_event = threading.Event()
+    state = MergeState()
+    status = {
+        "provider": None,
+        "pages": {name: 0 for name in PAGE_ITERATORS},
+        "finished": [],
+        "done": False,
+        "corpus_hits": 0,
+        "corpus_ms": 0.0,
+    }
+
+    if use_corpus:
+        start = time.perf_counter()
+        local = search_corpus(keyword, min_year, max_year)
+        status["corpus_ms"] = (time.perf_counter() - start) * 1000
+        status["corpus_hits"] = len(local)
+        if local:
+            state.add(local)
+            status["provider"] = "corpus"
+            yield build_results_df(state.records(), query=keyword), _snapshot(status)
+
+    threads = [
+        threading.Thread(
+            target=_pump_pages,
+            args=(name, fn(keyword, min_year, max_year), out_queue, stop_event),
+            daemon=True,
+        )
+        for name, fn in PAGE_ITERATORS.items()
+    ]
+    for t in threads:
+        t.start()
+
+    try:
+        while len(status["finished"]) < len(threads):
+            name, page = out_queue.get()
+            status["provider"] = name
+
+            if page is None:
+                status["finished"].append(name)
+                status["done"] = len(status["finished"]) == len(threads)
+                if status["done"]:
+                    yield finalize_records(state.records(), enrich=enrich, query=keyword), _snapshot(status)
+                continue
+
+            status["pages"][name] += 1
+            state.add(page)
+            yield build_results_df(state.records(), query=keyword), _snapshot(status)
+    finally:
+        # Lets the provider threads wind down if the caller stops early
+        stop_event.set()
+
+
+# =========================================================
+# PUBLIC ENTRYPOINT (UI CALLS THIS)
+# =========================================================
+def run_literature_search(keyword, min_year, max_year, concurrent=True, enrich=True):
+    records = search_corpus(keyword, min_year, max_year)
+    if concurrent:
+        records += run_providers_concurrently(keyword, min_year, max_year)
+    else:
+        records += run_providers_sequentially(keyword, min_year, max_year)
+
+    return finalize_records(merge_records(records), enrich=enrich, query=keyword)
@@ -0,0 +1,212 @@
+import json
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import pandas as pd
+from steps.step1_enrichment import enrich_records
+from steps.step1_literature_search import MergeState, PAGE_ITERATORS, ProviderError, build_results_df
+from utils.clustering import cluster_papers
+from utils.corpus_store import CORPUS_STORE
+from utils.dedup import merge_cluster
+from utils.records import PaperRecord
+
+# =========================================================
+# CONFIG
+# =========================================================
+SAVED_SEARCH_DIR = os.path.join("outputs", "saved_searches")
+
+# Providers index late and backfill dates, so every delta re-reads a
+# short window before the watermark; the merge drops what we already have.
+# S2 and OpenAlex filter on publication date (OpenAlex's created/updated
+# date filters need a Premium key), so a paper indexed more than this
+# long after its publication date is missed until the search is re-saved.
+WATERMARK_OVERLAP_DAYS = 7
+
+NEW_COLUMN = "New Since Last Run"
+
+
+# =========================================================
+# STORAGE
+# =========================================================
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-") or "search"
+
+
+def _search_dir(name):
+    return os.path.join(SAVED_SEARCH_DIR, _slug(name))
+
+
+def _spec_path(name):
+    return os.path.join(_search_dir(name), "search.json")
+
+
+def _corpus_path(name):
+    return os.path.join(_search_dir(name), "corpus.json")
+
+
+def save_search(name, query, min_year, max_year):
+    """Creates (or updates the parameters of) a saved search."""
+    os.makedirs(_search_dir(name), exist_ok=True)
+    spec = load_saved_search(name) or {"name": name, "watermarks": {}, "runs": []}
+
+    # Changing the query or year range invalidates the watermarks
+    if (spec.get("query"), spec.get("min_year"), spec.get("max_year")) != (query, min_year, max_year):
+        spec["watermarks"] = {}
+
+    spec.update({"query": query, "min_year": min_year, "max_year": max_year})
+    _write_spec(spec)
+    return spec
+
+
+def _write_spec(spec):
+    path = _spec_path(spec["name"])
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(spec, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_saved_search(name):
+    path = _spec_path(name)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_saved_searches():
+    if not os.path.isdir(SAVED_SEARCH_DIR):
+        return []
+    names = []
+    for entry in sorted(os.listdir(SAVED_SEARCH_DIR)):
+        path = os.path.join(SAVED_SEARCH_DIR, entry, "search.json")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                names.append(json.load(f)["name"])
+    return names
+
+
+def _json_value(value):
+    # NumPy scalars that slipped into a record
+    return value.item() if hasattr(value, "item") else str(value)
+
+
+def save_corpus(name, records):
+    path = _corpus_path(name)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump([r.to_dict() for r in records], f, default=_json_value)
+    os.replace(tmp, path)
+
+
+def load_corpus(name):
+    """Stored records of a saved search, or None before its first run."""
+    path = _corpus_path(name)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return [PaperRecord.from_dict(row) for row in json.load(f)]
+
+
+# =========================================================
+# DELTA FETCH
+# =========================================================
+def _fetch_provider(name, spec, since):
+    """(records, answered): answered is False when the provider failed part-way."""
+    records = []
+    pages = PAGE_ITERATORS[name](spec["query"], spec["min_year"], spec["max_year"], since=since, strict=True)
+    try:
+        for page in pages:
+            records.extend(page)
+    except ProviderError:
+        return records, False
+    return records, True
+
+
+def run_saved_search(name, enrich=True):
+    """
+    Re-runs a saved search fetching only what changed since each provider's
+    watermark, merges the delta into the stored corpus and flags rows that
+    were not in it before. Returns (df, summary).
+
+    Deltas are cut by publication date (arXiv: last-updated date) minus
+    WATERMARK_OVERLAP_DAYS, so papers a provider indexes later than that
+    are not picked up by delta runs; save the search again to reset the
+    watermarks and fetch everything.
+    """
+    spec = load_saved_search(name)
+    if spec is None:
+        raise ValueError(f"Saved search not found: {name}")
+
+    # Without a stored corpus (first run, or a corpus from an older format)
+    # the watermarks would hide everything fetched before
+    stored = load_corpus(name)
+    watermarks = spec["watermarks"] if stored is not None else {}
+
+    started = datetime.now()
+    since = {}
+    for provider in PAGE_ITERATORS:
+        mark = watermarks.get(provider)
+        since[provider] = (
+            datetime.fromisoformat(mark) - timedelta(days=WATERMARK_OVERLAP_DAYS) if mark else None
+        )
+
+    # 1️⃣ Fetch the delta from every provider in parallel
+    fetched, failed = {}, []
+    with ThreadPoolExecutor(max_workers=len(PAGE_ITERATORS)) as pool:
+        futures = {
+            provider: pool.submit(_fetch_provider, provider, spec, since[provider])
+            for provider in PAGE_ITERATORS
+        }
+        for provider, future in futures.items():
+            try:
+                fetched[provider], answered = future.result()
+            except Exception:
+                fetched[provider], answered = [], False
+            # Whatever arrived is still merged; only the watermark waits
+            if not answered:
+                failed.append(provider)
+
+    # 2️⃣ Merge the delta into the stored corpus
+    state = MergeState()
+    state.add(stored or [])
+    known = len(state.engine.records)
+    for provider in PAGE_ITERATORS:
+        state.add(fetched[provider])
+
+    engine = state.engine
+    merged, new_records = [], []
+    for group in engine.clusters():
+        record = merge_cluster([engine.records[i] for i in group])
+        merged.append(record)
+        if all(i >= known for i in group):
+            new_records.append(record)
+
+    report = enrich_records(new_records) if enrich and new_records else None
+
+    new_ids = {id(r) for r in new_records}
+    flags = pd.Categorical(["YES" if id(r) in new_ids else "NO" for r in merged])
+    df = cluster_papers(build_results_df(merged, report, extra_columns={NEW_COLUMN: flags}, query=spec["query"]))
+    CORPUS_STORE.upsert(merged)
+
+    # 3️⃣ Persist corpus + advance watermarks for providers that succeeded
+    os.makedirs(_search_dir(name), exist_ok=True)
+    save_corpus(name, merged)
+
+    for provider in PAGE_ITERATORS:
+        if provider not in failed:
+            spec["watermarks"][provider] = started.isoformat(timespec="seconds")
+
+    summary = {
+        "run_at": started.isoformat(timespec="seconds"),
+        "delta_mode": any(since.values()),
+        "fetched": {p: len(v) for p, v in fetched.items()},
+        "failed": failed,
+        "new": len(new_records),
+        "total": len(merged),
+    }
+    spec["runs"] = (spec.get("runs") or [])[-19:] + [summary]
+    _write_spec(spec)
+
+    return df, summary
@@ -0,0 +1,160 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from steps.step1_enrichment import S2_BATCH_FIELDS, fetch_s2_batch, s2_lookup_id
+from steps.step1_literature_search import build_results_df, s2_item_to_record
+from utils.dedup import DedupEngine
+
+# =========================================================
+# CONFIG
+# =========================================================
+SNOWBALL_DEPTH = 1
+SNOWBALL_BUDGET = 3000
+SNOWBALL_MAX_SEEDS = 200
+SNOWBALL_WORKERS = 4
+
+# Edge lists can be long for popular papers, so keep these batches small
+EDGE_BATCH_SIZE = 100
+EDGE_FIELDS = {
+    "backward": "paperId,references.paperId",
+    "forward": "paperId,citations.paperId",
+    "both": "paperId,references.paperId,citations.paperId",
+}
+
+
+# =========================================================
+# FRONTIER EXPANSION
+# =========================================================
+def _fetch_parallel(ids, fields, batch_size, max_workers):
+    """Runs fetch_s2_batch over chunks of `ids` concurrently and merges the results."""
+    chunks = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+    found = {}
+    if not chunks:
+        return found
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(fetch_s2_batch, chunk, fields, batch_size) for chunk in chunks]
+        for future in as_completed(futures):
+            try:
+                found.update(future.result())
+            except Exception:
+                continue
+    return found
+
+
+def _neighbours(item, direction):
+    ids = []
+    if direction in ("backward", "both"):
+        ids += [p.get("paperId") for p in (item.get("references") or [])]
+    if direction in ("forward", "both"):
+        ids += [p.get("paperId") for p in (item.get("citations") or [])]
+    return [pid for pid in ids if pid]
+
+
+def expand_citation_graph(seed_ids, depth=SNOWBALL_DEPTH, direction="both", budget=SNOWBALL_BUDGET, max_workers=SNOWBALL_WORKERS, progress_callback=None):
+    """
+    Breadth-first expansion of the citation graph from `seed_ids`.
+
+    Returns {paper_id: (connected_seeds, hop)} for every paper discovered
+    beyond the seeds. connected_seeds is the set of seeds a paper can be
+    reached from; the next frontier is the most-connected candidates first,
+    trimmed to what is left of the budget.
+    """
+    fields = EDGE_FIELDS[direction]
+
+    # Resolve DOI:/ARXIV: seed IDs to S2 paper IDs (the lookup is cached)
+    resolved = _fetch_parallel(list(dict.fromkeys(seed_ids)), fields, EDGE_BATCH_SIZE, max_workers)
+    origins = {}
+    edges = {}
+    for item in resolved.values():
+        pid = item.get("paperId")
+        if pid:
+            origins[pid] = {pid}
+            edges[pid] = item
+
+    seeds = set(origins)
+    hops = {pid: 0 for pid in seeds}
+    frontier = list(seeds)
+
+    for hop in range(1, depth + 1):
+        if hop > 1:
+            edges = _fetch_parallel(frontier, fields, EDGE_BATCH_SIZE, max_workers)
+
+        discovered = set()
+        for pid in frontier:
+            item = edges.get(pid)
+            if not item:
+                continue
+            for nb in _neighbours(item, direction):
+                if nb in seeds:
+                    continue
+                origins.setdefault(nb, set()).update(origins.get(pid, ()))
+                if nb not in hops:
+                    hops[nb] = hop
+                    discovered.add(nb)
+
+        if progress_callback:
+            progress_callback(hop, depth, len(hops) - len(seeds))
+
+        remaining = budget - (len(hops) - len(seeds))
+        if remaining <= 0 or not discovered:
+            break
+
+        frontier = sorted(discovered, key=lambda p: -len(origins[p]))[:remaining]
+
+    return {
+        pid: (origins[pid], hops[pid])
+        for pid in hops
+        if pid not in seeds
+    }
+
+
+# =========================================================
+# PUBLIC ENTRYPOINT
+# =========================================================
+def run_snowball(seed_records, depth=SNOWBALL_DEPTH, direction="both", budget=SNOWBALL_BUDGET, max_seeds=SNOWBALL_MAX_SEEDS, max_workers=SNOWBALL_WORKERS, progress_callback=None):
+    """
+    Forward / backward snowballing from the current results.
+
+    The most-cited `max_seeds` records are expanded for `depth` hops through
+    Semantic Scholar. Candidates already present in `seed_records` (by any
+    identifier or near-identical title) are dropped; the rest are ranked by
+    how many seeds connect to them, then by citations.
+    """
+    seed_records = list(seed_records)
+    ranked_seeds = sorted(seed_records, key=lambda r: -(r.get("Citations Count") or 0))[:max_seeds]
+    seed_ids = [pid for pid in (s2_lookup_id(r) for r in ranked_seeds) if pid]
+
+    candidates = expand_citation_graph(seed_ids, depth, direction, budget, max_workers, progress_callback)
+
+    ranked = sorted(candidates, key=lambda pid: (-len(candidates[pid][0]), candidates[pid][1]))[:budget]
+    metadata = _fetch_parallel(ranked, S2_BATCH_FIELDS, 500, max_workers)
+
+    # Dedupe against the existing corpus: anything that clusters with a
+    # known record is already covered
+    engine = DedupEngine()
+    engine.add_many(seed_records)
+    known = len(engine.records)
+
+    new_records = []
+    for pid in ranked:
+        item = metadata.get(pid)
+        if not item:
+            continue
+        record = s2_item_to_record(item)
+        new_records.append((engine.add(record), record))
+
+    covered = set()
+    for group in engine.clusters():
+        if any(i < known for i in group):
+            covered.update(group)
+
+    kept = [r for idx, r in new_records if idx is not None and idx not in covered]
+
+    df = build_results_df(kept)
+    if not df.empty:
+        connections = {pid: len(candidates[pid][0]) for pid in ranked}
+        df["Seed Connections"] = df["Semantic Scholar ID"].map(connections).astype("Int64")
+        df["Snowball Hop"] = df["Semantic Scholar ID"].map({pid: candidates[pid][1] for pid in ranked}).astype("Int64")
+        df = df.sort_values(
+            ["Seed Connections", "Citations Count"], ascending=[False, False]
+        ).reset_index(drop=True)
+    return df
@@ -1,11 +1,236 @@
+from collections import OrderedDict
+import threading
+import weakref
+import numpy as np
 import streamlit as st
 import pandas as pd
+from utils.paged_table import paged_table, selected_rows
+from utils.text_index import InvertedIndex, QuerySyntaxError
 
 
+# =========================================================
+# CONFIG
+# =========================================================
+# Result sets kept indexed at once (Step 1 results, uploads, snowball merges)
+FILTER_INDEX_CACHE_SIZE = 4
+# Filtered frames kept per result set, keyed by filter values
+FILTER_RESULT_CACHE_SIZE = 16
+
+
+def frame_fingerprint(df):
+    """
+    Content hash of every column, so frames that differ anywhere a filter,
+    the ranking or the keyword index could read never share a FilterIndex.
+    """
+    try:
+        row_hash = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    except TypeError:
+        # Unhashable cells (lists, dicts) are hashed by their text
+        row_hash = pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+    # Weighted sum so swapped rows change the fingerprint too
+    weights = np.arange(1, len(row_hash) + 1, dtype=np.uint64)
+    return (len(df), tuple(df.columns), int((row_hash * weights).sum()))
+
+
+# =========================================================
+# PRECOMPUTED FILTER INDEX
+# =========================================================
+class FilterIndex:
+    """
+    Per-result-set arrays parsed once (citations, years, flags, rank
+    order) plus memoized boolean masks per filter value, so a rerun only
+    recomputes the masks whose inputs changed.
+    """
+
+    def __init__(self, df):
+        n = len(df)
+        self.size = n
+        self._df = df
+        self._text_index = None
+        self.citations = (
+            pd.to_numeric(df["Citations Count"], errors="coerce").fillna(0).astype(float).to_numpy()
+            if "Citations Count" in df.columns else None
+        )
+        self.years = (
+            pd.to_numeric(df["Publication Year"], errors="coerce").astype(float).to_numpy()
+            if "Publication Year" in df.columns else None
+        )
+        self.review = (df["Review"] == "YES").fillna(False).to_numpy(dtype=bool) if "Review" in df.columns else None
+        self.open_access = (
+            df["Open Access"].fillna(False).astype(bool).to_numpy() if "Open Access" in df.columns else None
+        )
+
+        # Top N follows the blended relevance ranking when the search produced one
+        rank_column = "Rank Score" if "Rank Score" in df.columns else "Citations Count"
+        self.order = None
+        if rank_column in df.columns:
+            ranks = pd.to_numeric(df[rank_column], errors="coerce").fillna(-np.inf).astype(float).to_numpy()
+            self.order = np.argsort(-ranks, kind="stable")
+
+        self.clusters = None
+        if "Cluster ID" in df.columns:
+            # Own copy: to_numpy() may hand back a read-only view of the frame
+            clusters = pd.to_numeric(df["Cluster ID"], errors="coerce").astype(float).to_numpy(copy=True)
+            # Unclustered rows (e.g. appended snowball papers) each stand alone
+            missing = np.isnan(clusters)
+            clusters[missing] = -np.arange(1, missing.sum() + 1)
+            self.clusters = clusters.astype(np.int64)
+
+        self.year_options = (
+            sorted(np.unique(self.years[~np.isnan(self.years)]).astype(int).tolist(), reverse=True)
+            if self.years is not None else []
+        )
+        self._masks = {}
+        self.results = OrderedDict()
+        # Streamlit sessions run on separate threads and share equal frames' indexes
+        self._lock = threading.Lock()
+
+    @property
+    def text_index(self):
+        # Built on the first keyword search only, then reused for every keystroke
+        if self._text_index is None:
+            self._text_index = InvertedIndex(self._df)
+        return self._text_index
+
+    def mask(self, name, value):
+        key = (name, value)
+        cached = self._masks.get(key)
+        if cached is None:
+            cached = self._masks[key] = self._build_mask(name, value)
+        return cached
+
+    def _build_mask(self, name, value):
+        everything = np.ones(self.size, dtype=bool)
+        if name == "min_citations":
+            return self.citations >= value if self.citations is not None else everything
+        if name == "reviews_only":
+            return self.review if value and self.review is not None else everything
+        if name == "open_access_only":
+            return self.open_access if value and self.open_access is not None else everything
+        if name == "years":
+            return np.isin(self.years, list(value)) if value and self.years is not None else everything
+        if name == "keywords":
+            return self.text_index.search(value) if value else everything
+        raise ValueError(f"Unknown filter: {name}")
+
+    def positions(self, filters, top_n=0, one_per_cluster=False):
+        """
+        Row positions passing every filter, in rank order when top_n is set.
+        one_per_cluster keeps the best-ranked passing paper of each cluster.
+        """
+        combined = np.ones(self.size, dtype=bool)
+        for name, value in filters:
+            combined &= self.mask(name, value)
+        if one_per_cluster and self.clusters is not None:
+            ranked = self.order[combined[self.order]] if self.order is not None else np.flatnonzero(combined)
+            _, first = np.unique(self.clusters[ranked], return_index=True)
+            combined = np.zeros(self.size, dtype=bool)
+            combined[ranked[first]] = True
+        if top_n and top_n > 0 and self.order is not None:
+            ranked = self.order[combined[self.order]]
+            return ranked[:top_n]
+        return np.flatnonzero(combined)
+
+    def cached_result(self, key, df):
+        """Filtered frame memoized for `key`, if it was cut from this very `df`."""
+        with self._lock:
+            cached = self.results.get(key)
+            if cached is None or cached[0]() is not df:
+                return None
+            self.results.move_to_end(key)
+            return cached[1]
+
+    def store_result(self, key, df, filtered_df):
+        with self._lock:
+            self.results[key] = (weakref.ref(df), filtered_df)
+            while len(self.results) > FILTER_RESULT_CACHE_SIZE:
+                self.results.popitem(last=False)
+
+
+# Shared by every session thread; _CACHE_LOCK guards both dicts
+_CACHE_LOCK = threading.Lock()
+_FILTER_INDEXES = OrderedDict()
+# id(df) -> (weakref to df, fingerprint); result frames are never mutated
+# in place, so a live frame keeps its fingerprint and reruns skip hashing
+_FINGERPRINTS = {}
+
+
+def _cached_fingerprint(df):
+    with _CACHE_LOCK:
+        entry = _FINGERPRINTS.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+
+    fingerprint = frame_fingerprint(df)
+    with _CACHE_LOCK:
+        for key in [k for k, (ref, _) in _FINGERPRINTS.items() if ref() is None]:
+            del _FINGERPRINTS[key]
+        _FINGERPRINTS[id(df)] = (weakref.ref(df), fingerprint)
+    return fingerprint
+
+
+def get_filter_index(df):
+    fingerprint = _cached_fingerprint(df)
+    with _CACHE_LOCK:
+        index = _FILTER_INDEXES.get(fingerprint)
+        if index is not None:
+            _FILTER_INDEXES.move_to_end(fingerprint)
+            return index
+
+    # Built outside the lock so a large frame does not hold up other sessions;
+    # if two sessions race, both use the index that landed first. An evicted
+    # index stays valid for callers that still hold it.
+    index = FilterIndex(df)
+    with _CACHE_LOCK:
+        index = _FILTER_INDEXES.setdefault(fingerprint, index)
+        _FILTER_INDEXES.move_to_end(fingerprint)
+        while len(_FILTER_INDEXES) > FILTER_INDEX_CACHE_SIZE:
+            _FILTER_INDEXES.popitem(last=False)
+    return index
+
+
+def apply_filters(df, min_citations=0, reviews_only=False, open_access_only=False, year_selection=None, top_n=0, keywords="", one_per_cluster=False):
+    """
+    Filtered view of `df`, memoized per result set and filter values.
+    Row clicks rerun the script with unchanged filters and get the cached
+    frame back without touching the data. `keywords` is a boolean query
+    over title, abstract, venue and authors (see utils.text_index);
+    malformed queries raise QuerySyntaxError.
+    """
+    index = get_filter_index(df)
+    filters = (
+        ("min_citations", min_citations),
+        ("reviews_only", bool(reviews_only)),
+        ("open_access_only", bool(open_access_only)),
+        ("years", frozenset(year_selection or ())),
+        ("keywords", (keywords or "").strip()),
+    )
+    key = (filters, int(top_n or 0), bool(one_per_cluster))
+
+    # Masks are shared by equal frames; result frames only by the frame they came from
+    cached = index.cached_result(key, df)
+    if cached is not None:
+        return cached
+
+    filtered_df = df.iloc[index.positions(filters, top_n, one_per_cluster)].reset_index(drop=True)
+    index.store_result(key, df, filtered_df)
+    return filtered_df
+
+
+# =========================================================
+# UI
+# =========================================================
 def step2_filter_ui(df: pd.DataFrame):
     st.subheader("Filter & Select Papers")
 
     # ---------------- Filters ----------------
+    keywords = st.text_input(
+        "Search in results",
+        placeholder='e.g. transformer AND (lidar OR "point cloud") -survey',
+        help='Words are ANDed; supports OR, NOT / -word, ( ), "exact phrase" and prefix*. '
+             "Searches title, abstract, venue and authors.",
+    )
+
     #col1, col2, col3 = st.columns(3)
     col1, col2, col3, col4 = st.columns(4)
 
@@ -18,75 +243,51 @@ def step2_filter_ui(df: pd.DataFrame):
     with col4:
         top_n = st.number_input("Top N (0 = all)", min_value=0, value=0)
 
+    one_per_cluster = False
+    if "Cluster ID" in df.columns:
+        one_per_cluster = st.checkbox(
+            "One per cluster",
+            help="Keep only the best-ranked paper of each cluster of near-duplicates / same-subtopic papers.",
+        )
+
     '''if "Publication Year" in df.columns:
         year_min, year_max = int(df["Publication Year"].min()), int(df["Publication Year"].max())
         year_range = st.slider("Year range", year_min, year_max, (year_min, year_max))
     else:
         year_range = None'''
     year_selection = None
+    index = get_filter_index(df)
 
-    if "Publication Year" in df.columns:
-    
-        # Clean year values
-        years = (
-            pd.to_numeric(df["Publication Year"], errors="coerce")
-            .dropna()
-            .astype(int)
-            .unique()
+    if index.year_options:
+        year_selection = st.multiselect(
+            "Select Publication Year(s)",
+            options=index.year_options,
+            default=index.year_options  # default = all selected
         )
-    
-        if len(years) > 0:
-            years = sorted(years, reverse=True)  # Most recent first
-    
-            year_selection = st.multiselect(
-                "Select Publication Year(s)",
-                options=years,
-                default=years  # default = all selected
-            )
-
-
-    filtered_df = df.copy()
-
-    if "Citations Count" in df.columns:
-        filtered_df = filtered_df[filtered_df["Citations Count"] >= min_citations]
-
-    if reviews_only and "Review" in df.columns:
-        filtered_df = filtered_df[filtered_df["Review"] == "YES"]
-
-    if open_access_only and "Open Access" in df.columns:
-        filtered_df = filtered_df[filtered_df["Open Access"] == True]
 
-    '''if year_range and "Publication Year" in df.columns:
-        filtered_df = filtered_df[
-            (filtered_df["Publication Year"] >= year_range[0]) &
-            (filtered_df["Publication Year"] <= year_range[1])
-        ]'''
-    if year_selection and "Publication Year" in filtered_df.columns:
-        filtered_df = filtered_df[
-            filtered_df["Publication Year"].isin(year_selection)
-        ]
-
-
-    if top_n and top_n > 0 and "Citations Count" in df.columns:
-        filtered_df = filtered_df.sort_values("Citations Count", ascending=False).head(top_n)
-
-    filtered_df = filtered_df.reset_index(drop=True)
+    filters = dict(
+        min_citations=min_citations,
+        reviews_only=reviews_only,
+        open_access_only=open_access_only,
+        year_selection=year_selection,
+        top_n=top_n,
+        one_per_cluster=one_per_cluster,
+    )
+    try:
+        filtered_df = apply_filters(df, keywords=keywords, **filters)
+    except QuerySyntaxError as e:
+        st.error(f"Search query not understood ({e}); showing results without it.")
+        filtered_df = apply_filters(df, **filters)
 
     st.markdown("### Select papers to proceed")
 
     # ---------------- Row selection ----------------
-    selection = st.dataframe(
-        filtered_df,
-        use_container_width=True,
-        hide_index=True,
-        selection_mode="multi-row",
-        on_select="rerun",
-    )
-
-    selected_rows = selection.get("selection", {}).get("rows", [])
+    # Paginated: only the visible page goes to the browser, and the
+    # selection is kept by paper ID across pages and filter changes
+    selected = paged_table(filtered_df, key="step2", selectable=True)
+    selected_df = selected_rows(filtered_df, selected)
 
-    if selected_rows:
-        selected_df = filtered_df.iloc[selected_rows].reset_index(drop=True)
+    if len(selected_df):
         st.success(f"{len(selected_df)} rows selected")
         return selected_df
 
@@ -1,12 +1,46 @@
+import json
 import os
 import re
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 import streamlit as st
 import pandas as pd
-from time import sleep
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlsplit
 from bs4 import BeautifulSoup
-
+from lxml import etree
+from utils.http_client import HTTP_CLIENT
+from utils.pdf_store import PDF_STORE, pdf_keys, url_key
+from utils.pdf_strategies import HTML_STRATEGIES, PDF_STRATEGIES, learn_rewrite, url_domain
+
+
+# Minimum spacing between requests to the same host; different hosts are
+# paced independently by utils.rate_limiter
+DOWNLOAD_DELAY = 1.5
+
+# Downloads in flight overall, and against any single host
+DOWNLOAD_WORKERS = 8
+PER_HOST_CONCURRENCY = 2
+
+PDF_MAGIC = b"%PDF-"
+PDF_SNIFF_BYTES = 1024
+# Landing pages are parsed from at most this much of the first response
+HTML_MAX_BYTES = 2 * 1024 * 1024
+# Landing pages are fed to the parser in pieces so it can stop early
+HTML_FEED_CHUNK = 16 * 1024
+PDF_LINK_TAGS = ("a", "iframe", "embed")
+HEAD_END_RE = re.compile(r"</head\s*>", re.IGNORECASE)
+
+# Bytes per read/write while streaming a PDF to disk
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# In-progress downloads live in the store's staging area as <name>.pdf.part,
+# with the validators needed to resume them in <name>.pdf.part.json
+PART_SUFFIX = ".part"
+PART_META_SUFFIX = ".part.json"
+# A finished PDF ends with %%EOF within its last bytes
+PDF_EOF_MARKER = b"%%EOF"
+PDF_TAIL_BYTES = 2048
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/120 Safari/537.36",
@@ -18,131 +52,575 @@ def safe_filename(text):
     return "".join(c for c in text if c.isalnum() or c in (" ", "_", "-")).rstrip()
 
 
-def is_probably_pdf(resp):
-    ctype = resp.headers.get("Content-Type", "").lower()
-    return "application/pdf" in ctype or resp.url.lower().endswith(".pdf")
-
-
-def try_direct_download(url, path):
-    r = requests.get(url, headers=HEADERS, timeout=30, stream=True, allow_redirects=True)
-    r.raise_for_status()
-
-    # Allow HTML first if redirect ends in PDF (Elsevier)
-    if not is_probably_pdf(r):
-        return None, "NOT_PDF_RESPONSE", r.url
-
-    with open(path, "wb") as f:
-        for chunk in r.iter_content(chunk_size=8192):
-            if chunk:
-                f.write(chunk)
-
-    return path, "DIRECT", r.url
+# =========================================================
+# RESOLVER METRICS
+# =========================================================
+class ResolverStats:
+    """Requests spent per paper, by how the paper was resolved."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.papers = 0
+            self.requests = 0
+            self.outcomes = {}
+
+    def record(self, requests_used, outcome):
+        with self._lock:
+            self.papers += 1
+            self.requests += requests_used
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "papers": self.papers,
+                "requests": self.requests,
+                "requests_per_paper": self.requests / self.papers if self.papers else 0.0,
+                "outcomes": dict(self.outcomes),
+            }
+
+
+RESOLVER_STATS = ResolverStats()
+
+
+# =========================================================
+# SINGLE-REQUEST FETCH
+# =========================================================
+def sniff_pdf(head):
+    # Some servers send whitespace or a BOM before the header
+    return PDF_MAGIC in head[:PDF_SNIFF_BYTES]
+
+
+def is_complete_pdf(path):
+    """True when `path` holds a whole PDF: the header up front and %%EOF at the end."""
+    try:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            head = f.read(PDF_SNIFF_BYTES)
+            f.seek(max(0, size - PDF_TAIL_BYTES))
+            tail = f.read()
+    except OSError:
+        return False
+    return sniff_pdf(head) and PDF_EOF_MARKER in tail
+
+
+# =========================================================
+# PARTIAL DOWNLOADS
+# =========================================================
+def _read_part_meta(path):
+    try:
+        with open(path + PART_META_SUFFIX, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_part_meta(path, meta):
+    with open(path + PART_META_SUFFIX, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def _discard_part(path):
+    for suffix in (PART_SUFFIX, PART_META_SUFFIX):
+        try:
+            os.remove(path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def _resume_offset(path, url):
+    """Bytes already on disk for `url`, or 0 when there is nothing to resume."""
+    meta = _read_part_meta(path)
+    part = path + PART_SUFFIX
+    if not meta or not os.path.exists(part):
+        _discard_part(path)
+        return 0, None
+    # Left by another URL, e.g. the PDF linked from the landing page being
+    # fetched now: kept for that URL, and only overwritten by a PDF body
+    if meta.get("url") != url:
+        return 0, None
+    return os.path.getsize(part), meta
+
+
+def _expected_size(r, offset):
+    # Content-Length is the encoded size when the body is compressed
+    length = r.headers.get("Content-Length")
+    if not length or not length.isdigit() or r.headers.get("Content-Encoding"):
+        return None
+    return offset + int(length)
+
+
+def _finish_part(path, meta):
+    part = path + PART_SUFFIX
+    total = meta.get("total")
+    if total is not None and os.path.getsize(part) != total:
+        raise Exception(f"INCOMPLETE: {os.path.getsize(part)} of {total} bytes")
+    os.replace(part, path)
+    _discard_part(path)
+
+
+def fetch_pdf_or_html(url, path, min_interval=DOWNLOAD_DELAY, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """
+    One GET for `url`. The first bytes decide what the body is, whatever
+    the Content-Type or URL suffix claim: a PDF is streamed to `path`,
+    anything else is buffered (up to HTML_MAX_BYTES) for link extraction.
+
+    The PDF is written to `path`.part and renamed into place only once
+    complete, so `path` never holds a truncated file. A .part left by an
+    earlier, interrupted attempt is resumed with a Range request, guarded
+    by If-Range so a changed file is fetched again from the start; a
+    server that refuses the Range gets one plain request instead.
+
+    Returns (path, final_url, None) for a PDF, (None, final_url, html) otherwise.
+    """
+    offset, meta = _resume_offset(path, url)
+    headers = dict(HEADERS)
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        validator = meta.get("etag") or meta.get("last_modified")
+        if validator:
+            headers["If-Range"] = validator
+
+    r = HTTP_CLIENT.get(
+        url, headers=headers, timeout=30, stream=True, allow_redirects=True, min_interval=min_interval
+    )
+    try:
+        # The .part already holds every byte
+        if offset and r.status_code == 416 and meta.get("total") == offset:
+            _finish_part(path, meta)
+            return path, r.url, None
+
+        # Any other refusal of the Range would repeat on every attempt:
+        # drop the .part and fetch the whole file again
+        if offset and r.status_code not in (200, 206):
+            r.close()
+            _discard_part(path)
+            return fetch_pdf_or_html(url, path, min_interval, chunk_size)
+
+        r.raise_for_status()
+        chunks = HTTP_CLIENT.iter_content(r, chunk_size=chunk_size)
+
+        if offset and r.status_code == 206:
+            with open(path + PART_SUFFIX, "ab") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            _finish_part(path, meta)
+            return path, r.url, None
+
+        # Full body: anything left over from before is stale
+        if offset:
+            _discard_part(path)
+
+        head = b""
+        for chunk in chunks:
+            head += chunk
+            if len(head) >= PDF_SNIFF_BYTES:
+                break
+
+        if sniff_pdf(head):
+            meta = {
+                "url": url,
+                "etag": r.headers.get("ETag"),
+                "last_modified": r.headers.get("Last-Modified"),
+                "total": _expected_size(r, 0),
+            }
+            _write_part_meta(path, meta)
+            with open(path + PART_SUFFIX, "wb") as f:
+                f.write(head)
+                for chunk in chunks:
+                    f.write(chunk)
+            _finish_part(path, meta)
+            return path, r.url, None
+
+        body = bytearray(head)
+        for chunk in chunks:
+            if len(body) >= HTML_MAX_BYTES:
+                break
+            body.extend(chunk)
+        html = bytes(body[:HTML_MAX_BYTES]).decode(r.encoding or "utf-8", errors="replace")
+        return None, r.url, html
+    finally:
+        r.close()
+
+
+class _PdfLinkTarget:
+    """
+    lxml parser target that builds no tree: it only notes the first
+    citation_pdf_url meta tag and the first a / iframe / embed pointing
+    at a .pdf.
+    """
+
+    def __init__(self):
+        self.meta = None
+        self.link = None
+
+    def start(self, tag, attrib):
+        # libxml2 closes <head> early at the first body-only element (a
+        # stray <div>, text before <html>), so meta tags are taken
+        # wherever the parser places them
+        if tag == "meta" and self.meta is None:
+            if attrib.get("name") == "citation_pdf_url" and attrib.get("content"):
+                self.meta = attrib["content"]
+        elif tag in PDF_LINK_TAGS and self.link is None:
+            href = attrib.get("href") or attrib.get("src")
+            if href and ".pdf" in href.lower():
+                self.link = href
+
+    def end(self, tag):
+        pass
+
+    def data(self, data):
+        pass
+
+    def close(self):
+        return None
+
+
+class _PdfLinkScan:
+    """
+    Feeds a landing page to a streaming lxml parser only as far as a
+    mode needs: "meta" is settled once the source's own </head> has been
+    fed, "links" at the first PDF link, so most publisher pages are never
+    parsed past their head.
+    """
+
+    def __init__(self, html):
+        self.html = html
+        self.pos = 0
+        # Where the source closes its head; without one, meta needs the whole page
+        head_end = HEAD_END_RE.search(html)
+        self.head_end = head_end.end() if head_end else None
+        self.target = _PdfLinkTarget()
+        self.parser = etree.HTMLParser(target=self.target)
+        self.eof = False
+
+    def _settled(self, mode):
+        if mode == "meta":
+            return self.target.meta is not None or (self.head_end is not None and self.pos >= self.head_end)
+        return self.target.link is not None
+
+    def result(self, mode):
+        while not self.eof and not self._settled(mode):
+            if self.pos < len(self.html):
+                self.parser.feed(self.html[self.pos:self.pos + HTML_FEED_CHUNK])
+                self.pos += HTML_FEED_CHUNK
+            else:
+                self.parser.close()
+                self.eof = True
+        return self.target.meta if mode == "meta" else self.target.link
+
+
+def extract_pdf_link(html, base_url, order=HTML_STRATEGIES):
+    """
+    (PDF url, mode) found in a landing page, trying the modes of `order`
+    in turn, or (None, None). Parses with a streaming lxml target that
+    stops as soon as the answer is known; pages lxml rejects go through
+    BeautifulSoup instead.
+    """
+    scan = _PdfLinkScan(html)
+    try:
+        for mode in order:
+            if mode == "regex":
+                # Raw text regex
+                matches = re.findall(r"https?://[^\s\"']+\.pdf", html)
+                if matches:
+                    return matches[0], mode
+            else:
+                href = scan.result(mode)
+                if href:
+                    return urljoin(base_url, href), mode
+    except etree.LxmlError:
+        return extract_pdf_link_soup(html, base_url, order)
+    return None, None
+
+
+def extract_pdf_link_soup(html, base_url, order=HTML_STRATEGIES):
+    """extract_pdf_link on a full BeautifulSoup tree (slower; kept as the fallback)."""
+    soup = None
+    for mode in order:
+        if mode == "meta":
+            # Meta tag (Nature, Springer)
+            soup = soup or BeautifulSoup(html, "html.parser")
+            meta = soup.find("meta", attrs={"name": "citation_pdf_url"})
+            if meta and meta.get("content"):
+                return urljoin(base_url, meta["content"]), mode
+
+        elif mode == "links":
+            # Any visible PDF link
+            soup = soup or BeautifulSoup(html, "html.parser")
+            for tag in soup.find_all(["a", "iframe", "embed"]):
+                href = tag.get("href") or tag.get("src")
+                if href and ".pdf" in href.lower():
+                    return urljoin(base_url, href), mode
+
+        elif mode == "regex":
+            # Raw text regex
+            matches = re.findall(r"https?://[^\s\"']+\.pdf", html)
+            if matches:
+                return matches[0], mode
+
+    return None, None
 
 
 def extract_pdf_from_html(html, base_url):
-    soup = BeautifulSoup(html, "html.parser")
-
-    # 1️⃣ Meta tag (Nature, Springer)
-    meta = soup.find("meta", attrs={"name": "citation_pdf_url"})
-    if meta and meta.get("content"):
-        return urljoin(base_url, meta["content"])
-
-    # 2️⃣ Any visible PDF link
-    for tag in soup.find_all(["a", "iframe", "embed"]):
-        href = tag.get("href") or tag.get("src")
-        if href and ".pdf" in href.lower():
-            return urljoin(base_url, href)
-
-    # 3️⃣ Raw text regex
-    matches = re.findall(r"https?://[^\s\"']+\.pdf", html)
-    if matches:
-        return matches[0]
-
-    return None
-
-
-def try_html_fallback(url):
-    r = requests.get(url, headers=HEADERS, timeout=30, allow_redirects=True)
-    r.raise_for_status()
-
-    pdf_url = extract_pdf_from_html(r.text, r.url)
-    if not pdf_url:
-        return None, "HTML_NO_PDF"
-
-    return pdf_url, "HTML_EXTRACTED"
-
-
-def download_pdfs(df, output_dir="outputs/pdfs", report_path="outputs/pdf_download_report.xlsx", delay=1.5):
-    os.makedirs(output_dir, exist_ok=True)
+    return extract_pdf_link(html, base_url)[0]
+
+
+# =========================================================
+# PER-ROW DOWNLOAD
+# =========================================================
+class HostSlots:
+    """Caps how many downloads run against one host at the same time."""
+
+    def __init__(self, per_host=PER_HOST_CONCURRENCY):
+        self.per_host = per_host
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def slot(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            sem = self._slots.get(host)
+            if sem is None:
+                sem = self._slots[host] = threading.BoundedSemaphore(self.per_host)
+        with sem:
+            yield
+
+
+def _fetch_into_store(url, record, slots, delay, chunk_size, store):
+    """
+    Fetches `url` into `store` under an exclusive claim on its staging
+    file. A duplicate row that finished the same URL meanwhile, or a
+    complete file left in staging, is used without a request.
+
+    Returns (sha256 or None, final_url, html or None, requested).
+    """
+    with store.claim(url) as path:
+        sha256 = store.lookup([("url", url_key(url))])
+        if sha256:
+            return sha256, url, None, False
+        if is_complete_pdf(path):
+            return store.add(path, pdf_keys(record) + [("url", url_key(url))]), url, None, False
+
+        with slots.slot(url):
+            pdf_path, final_url, html = fetch_pdf_or_html(url, path, delay, chunk_size)
+        if not pdf_path:
+            return None, final_url, html, True
+        keys = pdf_keys(record, final_url) + [("url", url_key(url))]
+        return store.add(pdf_path, list(dict.fromkeys(keys))), final_url, None, True
+
+
+def download_one(record, slots, delay=DOWNLOAD_DELAY, chunk_size=DOWNLOAD_CHUNK_SIZE, store=PDF_STORE, strategies=PDF_STRATEGIES):
+    """
+    Downloads one paper into `store` and returns `record` with
+    download_status / resolved_pdf_url / failure_reason / pdf_sha256
+    filled in. A paper the store's manifest already knows by DOI, arXiv
+    ID or URL costs no request. Otherwise the best rewrite of the link
+    for its domain is tried, then the link itself, then the PDF link
+    found in the landing page; every outcome updates `strategies`.
+    Safe to call from worker threads: it never touches Streamlit.
+    """
+    url = record.get("PDF Link")
+    record["pdf_sha256"] = None
+
+    # ---------- 0️⃣ Already in the store ----------
+    sha256 = store.lookup(pdf_keys(record))
+    if sha256:
+        record["download_status"] = "success"
+        record["resolved_pdf_url"] = None
+        record["failure_reason"] = "STORE_HIT"
+        record["pdf_sha256"] = sha256
+        record["http_requests"] = 0
+        RESOLVER_STATS.record(0, "STORE_HIT")
+        return record
+
+    if not url or not isinstance(url, str):
+        record["download_status"] = "skipped"
+        record["resolved_pdf_url"] = "NO_URL"
+        record["failure_reason"] = "Missing PDF link"
+        return record
+
+    requests_used = 0
+    try:
+        domain = url_domain(url)
+
+        # ---------- 1️⃣ Rewritten URL (arXiv abs -> pdf, publisher /pdf/ ...) ----------
+        for strategy, pdf_url in strategies.rewrite_plan(url):
+            try:
+                sha256, final_url, _, requested = _fetch_into_store(pdf_url, record, slots, delay, chunk_size, store)
+                requests_used += requested
+            except Exception:
+                requests_used += 1
+                sha256 = None
+            strategies.record(domain, strategy, bool(sha256))
+            if sha256:
+                record["download_status"] = "success"
+                record["resolved_pdf_url"] = final_url
+                record["failure_reason"] = "REWRITE"
+                record["pdf_sha256"] = sha256
+                return record
+
+        # ---------- 2️⃣ One request: PDF, or the landing page to parse ----------
+        requests_used += 1
+        sha256, final_url, html, requested = _fetch_into_store(url, record, slots, delay, chunk_size, store)
+        if not requested:
+            requests_used -= 1
+        strategies.record(domain, "direct", bool(sha256))
+        if sha256:
+            record["download_status"] = "success"
+            record["resolved_pdf_url"] = final_url
+            # A duplicate row may have stored it while this one waited for the claim
+            record["failure_reason"] = "DIRECT" if requested else "STORE_HIT"
+            record["pdf_sha256"] = sha256
+            return record
+
+        # ---------- 3️⃣ PDF link from the already-buffered HTML ----------
+        page_domain = url_domain(final_url)
+        pdf_url, mode = extract_pdf_link(html, final_url, strategies.html_order(page_domain))
+        if not pdf_url:
+            raise Exception("HTML_NO_PDF")
+
+        requests_used += 1
+        sha256, final_url, _, requested = _fetch_into_store(pdf_url, record, slots, delay, chunk_size, store)
+        if not requested:
+            requests_used -= 1
+        strategies.record(page_domain, mode, bool(sha256))
+        if not sha256:
+            raise Exception("FALLBACK_NOT_PDF")
+
+        # Next time, papers of this domain can skip the landing page
+        learned = learn_rewrite(url, pdf_url)
+        if learned:
+            strategies.record(domain, learned, True)
+
+        record["download_status"] = "success"
+        record["resolved_pdf_url"] = final_url
+        record["failure_reason"] = "HTML_EXTRACTED"
+        record["pdf_sha256"] = sha256
+
+    except Exception as e:
+        record["download_status"] = "failed"
+        record["resolved_pdf_url"] = None
+        record["failure_reason"] = str(e)
+
+    finally:
+        record["http_requests"] = requests_used
+        outcome = record["failure_reason"] if record["download_status"] == "success" else "FAILED"
+        RESOLVER_STATS.record(requests_used, outcome)
+
+    return record
+
+
+def _unique_names(titles):
+    """One display file name per row; titles that sanitize alike get a numeric suffix."""
+    names, seen = [], {}
+    for title in titles:
+        base = safe_filename(title if isinstance(title, str) else "paper")[:120] or "paper"
+        n = seen.get(base.lower(), 0) + 1
+        seen[base.lower()] = n
+        names.append((base if n == 1 else f"{base} ({n})") + ".pdf")
+    return names
+
+
+def run_downloads(df, store=PDF_STORE, max_workers=DOWNLOAD_WORKERS, per_host=PER_HOST_CONCURRENCY, delay=DOWNLOAD_DELAY, progress_callback=None, chunk_size=DOWNLOAD_CHUNK_SIZE, strategies=PDF_STRATEGIES):
+    """
+    Downloads every row of `df` into `store` on a worker pool. `per_host`
+    caps the downloads in flight per host and the shared rate limiter
+    spaces requests to the same host by `delay`, so throughput grows with
+    the number of distinct hosts. Papers already in the store are not
+    fetched again, and interrupted downloads resume.
+
+    Returns the records and a display file name per row, in `df` order.
+    progress_callback(done, total, record) is called from the caller's
+    thread as each paper finishes.
+    """
+    records = [row for row in df.to_dict("records")]
+    names = _unique_names([r.get("Paper Title", "paper") for r in records])
+    slots = HostSlots(per_host)
+    results = [None] * len(records)
+
+    if not records:
+        return results, names
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(download_one, record, slots, delay, chunk_size, store, strategies): i
+            for i, record in enumerate(records)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            results[i] = future.result()
+            if progress_callback:
+                progress_callback(done, len(records), results[i])
+
+    for record, name in zip(results, names):
+        record["file_name"] = name
+    return results, names
+
+
+# =========================================================
+# PUBLIC ENTRYPOINT (UI CALLS THIS)
+# =========================================================
+def download_pdfs(df, store=PDF_STORE, report_path="outputs/pdf_download_report.xlsx", delay=DOWNLOAD_DELAY, max_workers=DOWNLOAD_WORKERS, per_host=PER_HOST_CONCURRENCY, chunk_size=DOWNLOAD_CHUNK_SIZE):
+    """
+    Step 3: fetches the PDFs of `df` into the content-addressed `store`
+    and writes the report. Returns ({file name: sha256} of the papers now
+    available, report frame); step 4 reads the bytes back by hash.
+    """
     os.makedirs(os.path.dirname(report_path), exist_ok=True)
 
     st.subheader("📥 Step 3 — Download PDFs")
 
-    results = []
-    downloaded_paths = []
-
+    RESOLVER_STATS.reset()
     progress = st.progress(0)
-    total = len(df)
-
-    for i, (_, row) in enumerate(df.iterrows(), start=1):
-        record = row.to_dict()
 
-        title = row.get("Paper Title", "paper")
-        url = row.get("PDF Link")
-
-        progress.progress(i / total)
-
-        if not url or not isinstance(url, str):
-            record["download_status"] = "skipped"
-            record["resolved_pdf_url"] = "NO_URL"
-            record["failure_reason"] = "Missing PDF link"
-            results.append(record)
+    def report_progress(done, total, record):
+        progress.progress(done / total)
+        title = record.get("Paper Title", "paper")
+        status = record["download_status"]
+        if status == "success":
+            if record["failure_reason"] == "STORE_HIT":
+                st.success(f"✅ Already downloaded: {title}")
+            else:
+                suffix = {"HTML_EXTRACTED": " (HTML)", "REWRITE": " (rewritten URL)"}.get(record["failure_reason"], "")
+                st.success(f"✅ Downloaded{suffix}: {title}")
+        elif status == "skipped":
             st.warning(f"⚠ Skipped: {title}")
-            continue
-
-        fname = safe_filename(title)[:120] + ".pdf"
-        path = os.path.join(output_dir, fname)
-
-        try:
-            # ---------- 1️⃣ Direct ----------
-            direct_path, mode, final_url = try_direct_download(url, path)
-            if direct_path:
-                record["download_status"] = "success"
-                record["resolved_pdf_url"] = final_url
-                record["failure_reason"] = mode
-                downloaded_paths.append(path)
-                results.append(record)
-                st.success(f"✅ Downloaded: {title}")
-                sleep(delay)
-                continue
-
-            # ---------- 2️⃣ HTML fallback ----------
-            pdf_url, reason = try_html_fallback(url)
-            if not pdf_url:
-                raise Exception(reason)
-
-            direct_path, mode, final_url = try_direct_download(pdf_url, path)
-            if not direct_path:
-                raise Exception("FALLBACK_PDF_DOWNLOAD_FAILED")
-
-            record["download_status"] = "success"
-            record["resolved_pdf_url"] = final_url
-            record["failure_reason"] = mode
-            downloaded_paths.append(path)
-            st.success(f"✅ Downloaded (HTML): {title}")
-
-        except Exception as e:
-            record["download_status"] = "failed"
-            record["resolved_pdf_url"] = None
-            record["failure_reason"] = str(e)
-            st.error(f"❌ Failed: {title} — {e}")
-
-        results.append(record)
-        sleep(delay)
+        else:
+            st.error(f"❌ Failed: {title} — {record['failure_reason']}")
+
+    results, names = run_downloads(
+        df,
+        store=store,
+        max_workers=max_workers,
+        per_host=per_host,
+        delay=delay,
+        progress_callback=report_progress,
+        chunk_size=chunk_size,
+    )
+
+    downloaded = {
+        name: record["pdf_sha256"]
+        for record, name in zip(results, names)
+        if record["download_status"] == "success"
+    }
 
     report_df = pd.DataFrame(results)
     report_df.to_excel(report_path, index=False)
 
     st.info(f"📄 Download report saved to: {report_path}")
 
-    return downloaded_paths, report_df
+    stats = RESOLVER_STATS.as_dict()
+    if stats["papers"]:
+        st.caption(
+            f"{stats['requests']} HTTP requests for {stats['papers']} papers "
+            f"({stats['requests_per_paper']:.2f} per paper) · "
+            + ", ".join(f"{k}: {v}" for k, v in sorted(stats["outcomes"].items()))
+        )
+
+    return downloaded, report_df
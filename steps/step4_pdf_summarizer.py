@@ -9,6 +9,7 @@ from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from docx.shared import Inches
 from utils.file_utils import create_zip
+from utils.pdf_store import PDF_STORE
 import streamlit as st
 
 
@@ -20,6 +21,23 @@ CHUNK_SIZE = 3500
 REDUCE_BATCH_SIZE = 3
 
 
+# ==============================
+# PDF LOADING
+# ==============================
+def load_pdfs_from_store(hashes, store=PDF_STORE):
+    """
+    hashes: Dict[str, str]  (file name -> sha256, as returned by step 3)
+    returns: Dict[str, bytes]
+    """
+    pdf_files = {}
+    for name, sha256 in hashes.items():
+        try:
+            pdf_files[name] = store.read(sha256)
+        except FileNotFoundError:
+            continue
+    return pdf_files
+
+
 # ==============================
 # TEXT EXTRACTION
 # ==============================
@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+from utils.dedup import UnionFind
+from utils.relevance import STOP_WORDS
+from utils.text_index import tokenize_rows
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+# Cosine similarity of TF-IDF vectors above which two papers share a cluster.
+# Conference/journal versions score ~0.8+, close subtopic neighbours ~0.5
+CLUSTER_SIMILARITY = 0.5
+
+# Terms in more than this share of papers carry no topic signal
+MAX_DF_RATIO = 0.3
+
+# Blocking: papers are only compared when they share one of their
+# BLOCK_KEYS heaviest terms, and terms shared by more than MAX_BLOCK_SIZE
+# papers are too generic to block on
+BLOCK_KEYS = 6
+MAX_BLOCK_SIZE = 200
+# ...and must share at least this many of those keys to be compared at all
+MIN_SHARED_KEYS = 2
+
+# Upper bound on (pair, term) entries held in memory at once
+DOT_CHUNK_ENTRIES = 4_000_000
+
+CLUSTER_ID_COLUMN = "Cluster ID"
+CLUSTER_RANK_COLUMN = "Cluster Rank"
+
+
+def _texts(df):
+    parts = [df[c].fillna("").astype(str) for c in ("Paper Title", "Abstract") if c in df.columns]
+    if not parts:
+        return pd.Series([""] * len(df), dtype=object)
+    texts = parts[0]
+    for part in parts[1:]:
+        texts = texts + " " + part
+    return texts.str.lower().reset_index(drop=True)
+
+
+# =========================================================
+# TF-IDF
+# =========================================================
+def tfidf_vectors(texts):
+    """
+    Sparse, L2-normalized TF-IDF rows in CSR form:
+    (doc_ptr, terms, weights, doc_freq). Entries are sorted by doc, then term.
+    """
+    n = len(texts)
+    codes, vocab, rows = tokenize_rows(texts)
+    vocab_size = max(len(vocab), 1)
+
+    keys = np.sort(rows.astype(np.int64) * vocab_size + codes)
+    if keys.size == 0:
+        return np.zeros(n + 1, dtype=np.int64), keys, np.zeros(0), np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    counts = np.diff(np.append(starts, keys.size))
+    keys = keys[starts]
+    docs, terms = keys // vocab_size, keys % vocab_size
+
+    doc_freq = np.bincount(terms, minlength=len(vocab))
+    stop = pd.Index(vocab).isin([w.encode() for w in STOP_WORDS])
+    keep = ~stop[terms] & (doc_freq[terms] <= max(2, MAX_DF_RATIO * n))
+    docs, terms, counts = docs[keep], terms[keep], counts[keep]
+
+    weights = (1 + np.log(counts)) * (np.log((1 + n) / (1 + doc_freq[terms])) + 1)
+    norms = np.sqrt(np.bincount(docs, weights=weights ** 2, minlength=n))
+    weights = weights / norms[docs]
+
+    doc_ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(docs, minlength=n), out=doc_ptr[1:])
+    return doc_ptr, terms, weights, doc_freq
+
+
+def candidate_pairs(doc_ptr, terms, weights, doc_freq):
+    """Unique (a, b) paper pairs sharing at least MIN_SHARED_KEYS blocking keys."""
+    n = len(doc_ptr) - 1
+    docs = np.repeat(np.arange(n), np.diff(doc_ptr))
+
+    # Blocking keys: each paper's heaviest terms that are neither unique nor generic
+    usable = (doc_freq[terms] >= 2) & (doc_freq[terms] <= MAX_BLOCK_SIZE)
+    d, t, w = docs[usable], terms[usable], weights[usable]
+    order = np.lexsort((-w, d))
+    d, t = d[order], t[order]
+    first = np.searchsorted(d, d)
+    keyed = (np.arange(d.size) - first) < BLOCK_KEYS
+    d, t = d[keyed], t[keyed]
+
+    # Group papers by key term; block sizes are capped by MAX_BLOCK_SIZE
+    order = np.lexsort((d, t))
+    d, t = d[order], t[order]
+    bounds = np.flatnonzero(np.concatenate(([True], t[1:] != t[:-1], [True])))
+
+    pairs = []
+    sizes = np.diff(bounds)
+    for size in np.unique(sizes[sizes >= 2]):
+        block_starts = bounds[:-1][sizes == size]
+        members = d[block_starts[:, None] + np.arange(size)]
+        i, j = np.triu_indices(size, k=1)
+        pairs.append(np.stack([members[:, i].ravel(), members[:, j].ravel()], axis=1))
+
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64)
+    pairs = np.concatenate(pairs)
+    keys = np.sort(pairs[:, 0].astype(np.int64) * n + pairs[:, 1])
+    starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+    shared = np.diff(np.append(starts, keys.size))
+    keys = keys[starts][shared >= MIN_SHARED_KEYS]
+    return np.stack([keys // n, keys % n], axis=1)
+
+
+def pair_cosines(pairs, doc_ptr, terms, weights, vocab_size):
+    """Exact cosine of each candidate pair by sparse dot product, in chunks."""
+    sims = np.zeros(len(pairs))
+    if len(pairs) == 0:
+        return sims
+
+    lengths = np.diff(doc_ptr)
+    # Walk the shorter vector of each pair, look the terms up in the other
+    a, b = pairs[:, 0], pairs[:, 1]
+    swap = lengths[a] > lengths[b]
+    a, b = np.where(swap, b, a), np.where(swap, a, b)
+
+    all_keys = np.repeat(np.arange(len(lengths)), lengths).astype(np.int64) * vocab_size + terms
+    per_pair = lengths[a]
+    ends = np.cumsum(per_pair)
+    start = 0
+    while start < len(pairs):
+        stop = int(np.searchsorted(ends, ends[start] - per_pair[start] + DOT_CHUNK_ENTRIES, side="right"))
+        stop = max(stop, start + 1)
+        pa, pb, pl = a[start:stop], b[start:stop], per_pair[start:stop]
+
+        pair_index = np.repeat(np.arange(stop - start), pl)
+        offsets = np.arange(pl.sum()) - np.repeat(np.cumsum(pl) - pl, pl)
+        entries = doc_ptr[pa][pair_index] + offsets
+
+        lookup = pb[pair_index].astype(np.int64) * vocab_size + terms[entries]
+        found = np.searchsorted(all_keys, lookup)
+        found = np.minimum(found, len(all_keys) - 1)
+        hit = all_keys[found] == lookup
+
+        products = np.where(hit, weights[entries] * weights[found], 0.0)
+        sims[start:stop] = np.bincount(pair_index, weights=products, minlength=stop - start)
+        start = stop
+    return sims
+
+
+# =========================================================
+# PUBLIC ENTRYPOINT
+# =========================================================
+def cluster_papers(df, threshold=CLUSTER_SIMILARITY):
+    """
+    Groups near-duplicate and same-subtopic papers by TF-IDF cosine over
+    title + abstract (single linkage above `threshold`) and adds
+    "Cluster ID" (1 = cluster of the best-ranked paper) and "Cluster Rank"
+    (1 = best paper of its cluster, by Rank Score, else citations).
+    """
+    df = df.copy()
+    n = len(df)
+    if n == 0:
+        df[CLUSTER_ID_COLUMN] = pd.Series(dtype="Int64")
+        df[CLUSTER_RANK_COLUMN] = pd.Series(dtype="Int64")
+        return df
+
+    texts = _texts(df)
+    doc_ptr, terms, weights, doc_freq = tfidf_vectors(texts)
+    pairs = candidate_pairs(doc_ptr, terms, weights, doc_freq)
+    sims = pair_cosines(pairs, doc_ptr, terms, weights, max(len(doc_freq), 1))
+
+    uf = UnionFind()
+    for _ in range(n):
+        uf.add()
+    for a, b in pairs[sims >= threshold]:
+        uf.union(int(a), int(b))
+    roots = np.array([uf.find(i) for i in range(n)])
+
+    # Rank papers, then number clusters by their best paper
+    rank_column = "Rank Score" if "Rank Score" in df.columns else "Citations Count"
+    if rank_column in df.columns:
+        score = pd.to_numeric(df[rank_column], errors="coerce").fillna(-np.inf).astype(float).to_numpy()
+        order = np.argsort(-score, kind="stable")
+    else:
+        order = np.arange(n)
+
+    _, first_seen, labels = np.unique(roots[order], return_index=True, return_inverse=True)
+    cluster_number = np.empty(len(first_seen), dtype=np.int64)
+    cluster_number[np.argsort(first_seen)] = np.arange(1, len(first_seen) + 1)
+
+    cluster_ids = np.empty(n, dtype=np.int64)
+    cluster_ids[order] = cluster_number[labels]
+
+    ranks = np.empty(n, dtype=np.int64)
+    ranks[order] = pd.Series(cluster_ids[order]).groupby(cluster_ids[order]).cumcount().to_numpy() + 1
+
+    df[CLUSTER_ID_COLUMN] = pd.array(cluster_ids, dtype="Int64")
+    df[CLUSTER_RANK_COLUMN] = pd.array(ranks, dtype="Int64")
+    return df
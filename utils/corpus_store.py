@@ -0,0 +1,253 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+from utils.dedup import merge_cluster, normalize_doi, normalize_title_key, record_identifiers
+from utils.records import PaperRecord
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+DEFAULT_CORPUS_PATH = os.path.join("outputs", "corpus", "corpus.sqlite")
+CORPUS_MAX_RESULTS = 1000
+
+# bm25() column weights: title, abstract, authors, venue
+FTS_WEIGHTS = (10.0, 1.0, 2.0, 1.0)
+
+
+def _json_default(value):
+    # numpy / pandas scalars coming from DataFrames and Excel imports
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _as_int(value):
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def fts_query(text):
+    """Every word of the query must match; words are quoted so user input can't break FTS syntax."""
+    words = re.findall(r"\w+", (text or "").lower())
+    return " ".join(f'"{w}"' for w in words)
+
+
+class CorpusStore:
+    """
+    Local SQLite corpus that accumulates every merged search result.
+
+    Papers are upserted by the same identifiers the dedup engine uses
+    (DOI, arXiv, PubMed, PMC, S2, OpenAlex), falling back to the
+    normalized title, so repeated searches refine one row per paper.
+    An FTS5 index over title, abstract, authors and venue answers
+    queries locally before any provider is contacted.
+    """
+
+    def __init__(self, path=DEFAULT_CORPUS_PATH, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn = None
+
+    # -----------------------------
+    # Storage
+    # -----------------------------
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS papers (
+                    paper_id INTEGER PRIMARY KEY,
+                    title_key TEXT,
+                    doi TEXT,
+                    year INTEGER,
+                    citations INTEGER,
+                    data TEXT,
+                    updated_at REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_papers_title ON papers(title_key);
+
+                CREATE TABLE IF NOT EXISTS identifiers (
+                    namespace TEXT,
+                    value TEXT,
+                    paper_id INTEGER,
+                    PRIMARY KEY (namespace, value)
+                );
+                CREATE INDEX IF NOT EXISTS idx_identifiers_paper ON identifiers(paper_id);
+
+                CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5(
+                    title, abstract, authors, venue,
+                    tokenize = 'porter unicode61'
+                );
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _load(self, conn, paper_id):
+        row = conn.execute("SELECT data FROM papers WHERE paper_id = ?", (paper_id,)).fetchone()
+        return PaperRecord.from_dict(json.loads(row[0])) if row else None
+
+    def _match(self, conn, record):
+        """paper_ids already holding this record, by identifier then title."""
+        ids = set()
+        for namespace, value in record_identifiers(record):
+            row = conn.execute(
+                "SELECT paper_id FROM identifiers WHERE namespace = ? AND value = ?",
+                (namespace, value),
+            ).fetchone()
+            if row:
+                ids.add(row[0])
+        if ids:
+            return sorted(ids)
+
+        title_key = normalize_title_key(record.get("Paper Title"))
+        if not title_key:
+            return []
+        doi = normalize_doi(record.get("DOI"))
+        for paper_id, stored_doi in conn.execute(
+            "SELECT paper_id, doi FROM papers WHERE title_key = ?", (title_key,)
+        ):
+            # Same title but different DOIs are different papers
+            if not (doi and stored_doi and doi != stored_doi):
+                return [paper_id]
+        return []
+
+    def _write(self, conn, paper_id, record, now):
+        data = json.dumps(record.to_dict(), default=_json_default)
+        params = (
+            normalize_title_key(record.get("Paper Title")),
+            normalize_doi(record.get("DOI")),
+            _as_int(record.get("Publication Year")),
+            _as_int(record.get("Citations Count")),
+            data,
+            now,
+        )
+        if paper_id is None:
+            paper_id = conn.execute(
+                "INSERT INTO papers (title_key, doi, year, citations, data, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                params,
+            ).lastrowid
+        else:
+            conn.execute(
+                "UPDATE papers SET title_key = ?, doi = ?, year = ?, citations = ?, data = ?, updated_at = ? WHERE paper_id = ?",
+                params + (paper_id,),
+            )
+            conn.execute("DELETE FROM papers_fts WHERE rowid = ?", (paper_id,))
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO identifiers VALUES (?, ?, ?)",
+            [(namespace, value, paper_id) for namespace, value in record_identifiers(record)],
+        )
+        conn.execute(
+            "INSERT INTO papers_fts (rowid, title, abstract, authors, venue) VALUES (?, ?, ?, ?, ?)",
+            (
+                paper_id,
+                record.get("Paper Title") or "",
+                record.get("Abstract") or "",
+                record.get("Author Names") or "",
+                record.get("Publication Title") or "",
+            ),
+        )
+        return paper_id
+
+    def _drop(self, conn, paper_id):
+        conn.execute("DELETE FROM papers WHERE paper_id = ?", (paper_id,))
+        conn.execute("DELETE FROM papers_fts WHERE rowid = ?", (paper_id,))
+        conn.execute("DELETE FROM identifiers WHERE paper_id = ?", (paper_id,))
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+    def upsert(self, records):
+        """
+        Inserts new papers and merges the rest into their stored row: the
+        incoming record wins, stored values fill its gaps. Rows that the
+        incoming record shows to be the same paper are folded together.
+        Returns (inserted, updated).
+        """
+        if not self.enabled:
+            return 0, 0
+
+        inserted = updated = 0
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                for record in records:
+                    ids = self._match(conn, record)
+                    if not ids:
+                        self._write(conn, None, record.copy(), now)
+                        inserted += 1
+                        continue
+
+                    stored = [r for r in (self._load(conn, pid) for pid in ids) if r is not None]
+                    merged = merge_cluster([record] + stored)
+                    for pid in ids[1:]:
+                        self._drop(conn, pid)
+                    self._write(conn, ids[0], merged, now)
+                    updated += 1
+        return inserted, updated
+
+    def search(self, query, min_year=None, max_year=None, limit=CORPUS_MAX_RESULTS):
+        """Full-text search over the corpus, best bm25 match first."""
+        match = fts_query(query)
+        if not self.enabled or not match:
+            return []
+
+        sql = (
+            "SELECT p.data FROM papers_fts JOIN papers p ON p.paper_id = papers_fts.rowid "
+            "WHERE papers_fts MATCH ?"
+        )
+        params = [match]
+        if min_year is not None:
+            sql += " AND p.year >= ?"
+            params.append(min_year)
+        if max_year is not None:
+            sql += " AND p.year <= ?"
+            params.append(max_year)
+        sql += " ORDER BY bm25(papers_fts, ?, ?, ?, ?) LIMIT ?"
+        params += list(FTS_WEIGHTS) + [limit]
+
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [PaperRecord.from_dict(json.loads(data)) for (data,) in rows]
+
+    def import_excel(self, path_or_buffer):
+        """Bulk-imports an existing step1_raw_results.xlsx; returns (inserted, updated)."""
+        df = pd.read_excel(path_or_buffer)
+        records = [PaperRecord.from_dict(row) for row in df.to_dict("records")]
+        return self.upsert([r for r in records if r.get("Paper Title")])
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM papers")
+                conn.execute("DELETE FROM identifiers")
+                conn.execute("DELETE FROM papers_fts")
+
+    def stats(self):
+        with self._lock:
+            conn = self._connect()
+            papers = conn.execute("SELECT COUNT(*) FROM papers").fetchone()[0]
+            identifiers = conn.execute("SELECT COUNT(*) FROM identifiers").fetchone()[0]
+        return {"papers": papers, "identifiers": identifiers}
+
+
+# Process-wide corpus fed by every step 1 search
+CORPUS_STORE = CorpusStore()
@@ -0,0 +1,314 @@
+import re
+import zlib
+import numpy as np
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+TITLE_SHINGLE_SIZE = 4
+MINHASH_PERMUTATIONS = 64
+LSH_BANDS = 16
+TITLE_SIMILARITY_THRESHOLD = 0.8
+MAX_BUCKET_CANDIDATES = 50
+
+_MERSENNE_PRIME = np.uint64(4294967311)
+
+
+# =========================================================
+# IDENTIFIER NORMALIZATION
+# =========================================================
+def normalize_doi(doi):
+    if not doi or not isinstance(doi, str):
+        return None
+    doi = doi.lower().strip()
+    doi = re.sub(r"^(https?://(dx\.)?doi\.org/|doi:)", "", doi)
+    return doi or None
+
+
+def is_arxiv_doi(doi):
+    # DataCite DOIs minted for arXiv preprints never conflict with a journal DOI
+    return bool(doi) and doi.startswith("10.48550/arxiv.")
+
+
+def normalize_arxiv_id(arxiv_id):
+    if not arxiv_id or not isinstance(arxiv_id, str):
+        return None
+    arxiv_id = arxiv_id.lower().strip()
+    arxiv_id = re.sub(r"^(https?://arxiv\.org/(abs|pdf)/|arxiv:)", "", arxiv_id)
+    return re.sub(r"v\d+$", "", arxiv_id) or None
+
+
+def normalize_plain_id(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    value = str(value).strip().rstrip("/").split("/")[-1].lower()
+    return value or None
+
+
+def normalize_title_key(title):
+    return re.sub(r"\W+", "", title.lower()) if isinstance(title, str) and title else None
+
+
+def record_identifiers(record):
+    """
+    Every identifier a record carries, as (namespace, value) keys.
+    The arXiv DOI is folded into the arXiv namespace so a preprint found
+    through its DataCite DOI joins the same paper found by arXiv ID.
+    """
+    keys = []
+
+    doi = normalize_doi(record.get("DOI"))
+    if doi:
+        if is_arxiv_doi(doi):
+            keys.append(("arxiv", doi.replace("10.48550/arxiv.", "")))
+        else:
+            keys.append(("doi", doi))
+
+    for namespace, column, normalize in (
+        ("arxiv", "arXiv ID", normalize_arxiv_id),
+        ("pmid", "PubMed ID", normalize_plain_id),
+        ("pmcid", "PMC ID", normalize_plain_id),
+        ("s2", "Semantic Scholar ID", normalize_plain_id),
+        ("openalex", "OpenAlex ID", normalize_plain_id),
+    ):
+        value = normalize(record.get(column))
+        if value:
+            keys.append((namespace, value))
+
+    return keys
+
+
+# =========================================================
+# UNION-FIND
+# =========================================================
+class UnionFind:
+    def __init__(self):
+        self.parent = []
+        self.size = []
+
+    def add(self):
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        return len(self.parent) - 1
+
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return ra
+
+    def groups(self):
+        groups = {}
+        for x in range(len(self.parent)):
+            groups.setdefault(self.find(x), []).append(x)
+        return list(groups.values())
+
+
+# =========================================================
+# MINHASH / LSH
+# =========================================================
+def title_shingles(title, size=TITLE_SHINGLE_SIZE):
+    key = normalize_title_key(title)
+    if not key or len(key) < size * 2:
+        return None
+    return {key[i:i + size] for i in range(len(key) - size + 1)}
+
+
+class MinHasher:
+    def __init__(self, num_perm=MINHASH_PERMUTATIONS, seed=1):
+        rng = np.random.default_rng(seed)
+        # Coefficients stay below 2**31 so a * crc32 fits in uint64
+        self.a = rng.integers(1, 2 ** 31, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 2 ** 31, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingles):
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1)
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+# =========================================================
+# DEDUP ENGINE
+# =========================================================
+class DedupEngine:
+    """
+    Incremental multi-key deduplication.
+
+    Records are linked when they share any identifier (DOI, arXiv ID,
+    PubMed / PMC ID, Semantic Scholar / OpenAlex ID) or an exact normalized
+    title. Near-duplicate titles are found with MinHash LSH blocking, so
+    each new record is only compared with the handful of records that share
+    a band bucket, and confirmed with exact shingle Jaccard plus a year check.
+    Title-based links are refused when both sides carry different journal
+    DOIs, which keeps generic titles ("Editorial") from collapsing.
+    """
+
+    def __init__(
+        self,
+        threshold=TITLE_SIMILARITY_THRESHOLD,
+        num_perm=MINHASH_PERMUTATIONS,
+        bands=LSH_BANDS,
+        max_bucket=MAX_BUCKET_CANDIDATES,
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_bucket = max_bucket
+        self.hasher = MinHasher(num_perm)
+
+        self.records = []
+        self.uf = UnionFind()
+        self.id_index = {}
+        self.buckets = {}
+        self.shingles = []
+        self.years = []
+        self.dois = []
+
+    # -----------------------------
+    # Linking
+    # -----------------------------
+    def _doi_conflict(self, a, b):
+        da = self.dois[self.uf.find(a)]
+        db = self.dois[self.uf.find(b)]
+        return bool(da and db and da.isdisjoint(db))
+
+    def _union(self, a, b, guarded):
+        if guarded and self._doi_conflict(a, b):
+            return
+        ra, rb = self.uf.find(a), self.uf.find(b)
+        if ra == rb:
+            return
+        root = self.uf.union(ra, rb)
+        other = rb if root == ra else ra
+        self.dois[root] = self.dois[root] | self.dois[other]
+
+    def _years_compatible(self, a, b):
+        ya, yb = self.years[a], self.years[b]
+        return ya is None or yb is None or abs(ya - yb) <= 1
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+    def add(self, record):
+        identifiers = record_identifiers(record)
+        title_key = normalize_title_key(record.get("Paper Title"))
+        if not identifiers and not title_key:
+            # Nothing to key on; such rows were always dropped by the merge
+            return None
+
+        idx = self.uf.add()
+        self.records.append(record)
+
+        doi = normalize_doi(record.get("DOI"))
+        self.dois.append({doi} if doi and not is_arxiv_doi(doi) else set())
+
+        year = record.get("Publication Year")
+        try:
+            self.years.append(int(year) if year is not None and year == year else None)
+        except (TypeError, ValueError):
+            self.years.append(None)
+
+        for key in identifiers:
+            if key in self.id_index:
+                self._union(idx, self.id_index[key], guarded=False)
+            else:
+                self.id_index[key] = idx
+
+        if title_key:
+            key = ("title", title_key)
+            if key in self.id_index:
+                self._union(idx, self.id_index[key], guarded=True)
+                self.shingles.append(None)
+                return idx
+            self.id_index[key] = idx
+
+        shingles = title_shingles(record.get("Paper Title"))
+        self.shingles.append(shingles)
+        if not shingles:
+            return idx
+
+        signature = self.hasher.signature(shingles)
+        checked = set()
+        for band in range(self.bands):
+            bucket_key = (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            bucket = self.buckets.setdefault(bucket_key, [])
+
+            for other in bucket:
+                if other in checked:
+                    continue
+                checked.add(other)
+                if (
+                    self._years_compatible(idx, other)
+                    and jaccard(shingles, self.shingles[other]) >= self.threshold
+                ):
+                    self._union(idx, other, guarded=True)
+
+            if len(bucket) < self.max_bucket:
+                bucket.append(idx)
+
+        return idx
+
+    def add_many(self, records):
+        for r in records:
+            self.add(r)
+
+    def clusters(self):
+        return self.uf.groups()
+
+
+def merge_cluster(records):
+    """
+    Collapse one cluster into a single record: the first record wins,
+    gaps are filled from the others, citations take the max, any
+    preprint member marks the merged paper as a preprint and the
+    matched queries of every member are unioned.
+    """
+    merged = records[0].copy()
+    queries = []
+    for r in records:
+        for q in (r.get("Matched Queries") or "").split("; "):
+            if q and q not in queries:
+                queries.append(q)
+    if queries:
+        merged["Matched Queries"] = "; ".join(queries)
+
+    for r in records[1:]:
+        merged["Citations Count"] = max(
+            merged.get("Citations Count") or 0, r.get("Citations Count") or 0
+        )
+        for col, value in r.items():
+            if not merged.get(col):
+                merged[col] = value
+        if r.get("Preprint") == "YES":
+            merged["Preprint"] = "YES"
+            merged["arXiv_used"] = "YES"
+    return merged
+
+
+def deduplicate(records, **engine_kwargs):
+    engine = DedupEngine(**engine_kwargs)
+    engine.add_many(records)
+    return [merge_cluster([engine.records[i] for i in group]) for group in engine.clusters()]
@@ -0,0 +1,236 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.rate_limiter import RATE_LIMITER
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+# Metadata APIs: few long-lived connections, patient retries
+API_HOST_POOL_SIZES = {
+    "api.semanticscholar.org": 4,
+    "api.openalex.org": 4,
+    "export.arxiv.org": 2,
+}
+
+# Everything else (publisher landing pages, PDF hosts)
+DEFAULT_POOL_CONNECTIONS = 32
+DEFAULT_POOL_MAXSIZE = 8
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 429 / 503 are retried by the rate limiter (honoring Retry-After),
+# not by urllib3, so the wait is bounded and shows up in limiter stats
+MAX_THROTTLE_RETRIES = 3
+
+
+def api_retry_policy():
+    return Retry(
+        total=4,
+        connect=4,
+        read=4,
+        backoff_factor=2,
+        status_forcelist=[500, 502, 504],
+        allowed_methods=["GET", "HEAD", "POST"],
+        raise_on_status=False,
+    )
+
+
+def download_retry_policy():
+    return Retry(
+        total=2,
+        connect=2,
+        read=1,
+        backoff_factor=0.5,
+        status_forcelist=[502, 504],
+        allowed_methods=["GET", "HEAD"],
+        raise_on_status=False,
+    )
+
+
+# =========================================================
+# METRICS
+# =========================================================
+class HostMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.status_codes = {}
+
+    def observe(self, latency, status=None, retries=0, nbytes=0, error=False):
+        self.requests += 1
+        self.retries += retries
+        self.bytes += nbytes
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+
+        bucket = len(LATENCY_BUCKETS)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                bucket = i
+                break
+        self.histogram[bucket] += 1
+
+        if error:
+            self.errors += 1
+        if status is not None:
+            self.status_codes[status] = self.status_codes.get(status, 0) + 1
+
+    def as_dict(self):
+        labels = [f"<={b}s" for b in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]}s"]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "bytes": self.bytes,
+            "avg_latency_s": self.latency_total / self.requests if self.requests else 0.0,
+            "max_latency_s": self.latency_max,
+            "latency_histogram": dict(zip(labels, self.histogram)),
+            "status_codes": dict(self.status_codes),
+        }
+
+
+# =========================================================
+# CLIENT
+# =========================================================
+class HttpClient:
+    """
+    Process-wide HTTP client shared by the search and PDF download steps.
+
+    One requests.Session with keep-alive pools sized per host, a retry
+    policy per host class, per-host rate limiting, and per-host metrics
+    (requests, bytes, latency histogram, retries).
+    """
+
+    def __init__(self, host_pool_sizes=None, rate_limiter=RATE_LIMITER):
+        self.session = requests.Session()
+        self.rate_limiter = rate_limiter
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+        default_adapter = HTTPAdapter(
+            max_retries=download_retry_policy(),
+            pool_connections=DEFAULT_POOL_CONNECTIONS,
+            pool_maxsize=DEFAULT_POOL_MAXSIZE,
+        )
+        self.session.mount("https://", default_adapter)
+        self.session.mount("http://", default_adapter)
+
+        for host, size in (host_pool_sizes or API_HOST_POOL_SIZES).items():
+            adapter = HTTPAdapter(max_retries=api_retry_policy(), pool_connections=1, pool_maxsize=size)
+            self.session.mount(f"https://{host}/", adapter)
+            self.session.mount(f"http://{host}/", adapter)
+
+    # -----------------------------
+    # Metrics
+    # -----------------------------
+    def _host_metrics(self, url):
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            metrics = self._metrics.get(host)
+            if metrics is None:
+                metrics = self._metrics[host] = HostMetrics()
+        return host, metrics
+
+    def record_bytes(self, url, nbytes):
+        _, metrics = self._host_metrics(url)
+        with self._lock:
+            metrics.bytes += nbytes
+
+    def stats(self):
+        with self._lock:
+            return {host: m.as_dict() for host, m in self._metrics.items()}
+
+    def stats_frame(self):
+        limiter_stats = self.rate_limiter.stats() if self.rate_limiter else {}
+        rows = []
+        for host, m in self.stats().items():
+            row = {"host": host}
+            row.update({k: v for k, v in m.items() if k not in ("latency_histogram", "status_codes")})
+            limits = limiter_stats.get(host, {})
+            row["wait_seconds"] = limits.get("wait_seconds", 0.0)
+            row["throttled"] = limits.get("throttled", 0)
+            row.update(m["latency_histogram"])
+            rows.append(row)
+        return pd.DataFrame(rows)
+
+    def reset_stats(self):
+        with self._lock:
+            self._metrics = {}
+
+    # -----------------------------
+    # Requests
+    # -----------------------------
+    def request(self, method, url, rate_limited=True, min_interval=None, **kwargs):
+        """
+        Send a request through the host's rate limiter. Throttled responses
+        (429 / 503) are retried at most MAX_THROTTLE_RETRIES times after the
+        limiter's Retry-After or backoff pause; the last response is returned.
+        """
+        limiter = self.rate_limiter if rate_limited else None
+
+        for attempt in range(MAX_THROTTLE_RETRIES + 1):
+            if limiter:
+                limiter.acquire(url, min_interval)
+
+            r = self._send(method, url, **kwargs)
+
+            if not limiter or not limiter.observe(url, r.status_code, r.headers):
+                return r
+            if attempt == MAX_THROTTLE_RETRIES:
+                return r
+            r.close()
+
+    def _send(self, method, url, **kwargs):
+        stream = kwargs.get("stream", False)
+        host, metrics = self._host_metrics(url)
+        start = time.perf_counter()
+
+        try:
+            r = self.session.request(method, url, **kwargs)
+        except requests.exceptions.RequestException:
+            with self._lock:
+                metrics.observe(time.perf_counter() - start, error=True)
+            raise
+
+        latency = time.perf_counter() - start
+        history = getattr(getattr(r.raw, "retries", None), "history", None) or ()
+        # Streamed bodies are counted as they are consumed (see iter_content)
+        nbytes = 0 if stream else len(r.content)
+
+        with self._lock:
+            metrics.observe(
+                latency,
+                status=r.status_code,
+                retries=len(history),
+                nbytes=nbytes,
+                error=r.status_code >= 400,
+            )
+        return r
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def iter_content(self, response, chunk_size=64 * 1024):
+        """Stream a response body, counting the bytes against its host."""
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if chunk:
+                self.record_bytes(response.url, len(chunk))
+                yield chunk
+
+
+HTTP_CLIENT = HttpClient()
@@ -0,0 +1,194 @@
+import math
+import threading
+import weakref
+
+import pandas as pd
+import streamlit as st
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+PAGE_SIZES = [25, 50, 100, 250]
+DEFAULT_PAGE_SIZE = 50
+
+# Long text columns left out of the grid; shown one paper at a time
+LAZY_COLUMNS = ("Abstract",)
+
+SELECT_COLUMN = "Select"
+
+# Identifier columns in order of preference for the stable paper ID
+ID_COLUMNS = [
+    ("doi", "DOI"),
+    ("arxiv", "arXiv ID"),
+    ("s2", "Semantic Scholar ID"),
+    ("openalex", "OpenAlex ID"),
+    ("pmid", "PubMed ID"),
+]
+
+
+# =========================================================
+# STABLE PAPER IDS
+# =========================================================
+def _clean(series):
+    return series.astype("string").str.strip().str.lower().replace("", pd.NA)
+
+
+def paper_ids(df):
+    """
+    One stable ID per row (first available identifier, else normalized
+    title + year). Survives filtering, sorting and re-running the search,
+    so selections can be tracked across pages and filter changes.
+    """
+    ids = pd.Series(pd.NA, index=df.index, dtype="string")
+    for namespace, column in ID_COLUMNS:
+        if column not in df.columns:
+            continue
+        values = _clean(df[column])
+        if column == "DOI":
+            values = values.str.replace(r"^https?://(dx\.)?doi\.org/", "", regex=True)
+        ids = ids.fillna(namespace + ":" + values)
+
+    if "Paper Title" in df.columns:
+        title = _clean(df["Paper Title"]).str.replace(r"\W+", "", regex=True)
+        year = (
+            df["Publication Year"].astype("string").fillna("")
+            if "Publication Year" in df.columns else ""
+        )
+        ids = ids.fillna("title:" + title + ":" + year)
+
+    ids = ids.fillna("row:" + pd.Series(range(len(df)), index=df.index).astype("string"))
+
+    # Rows that still collide (e.g. an uploaded sheet with duplicates) get a suffix
+    repeat = ids.groupby(ids).cumcount()
+    return ids.where(repeat == 0, ids + "#" + repeat.astype("string")).astype(str)
+
+
+# Shared by every session thread
+_ID_CACHE_LOCK = threading.Lock()
+_ID_CACHE = {}
+
+
+def cached_paper_ids(df):
+    """paper_ids() memoized per live frame; result frames are not mutated in place."""
+    with _ID_CACHE_LOCK:
+        entry = _ID_CACHE.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+
+    ids = paper_ids(df)
+    with _ID_CACHE_LOCK:
+        for key in [k for k, (ref, _) in _ID_CACHE.items() if ref() is None]:
+            del _ID_CACHE[key]
+        _ID_CACHE[id(df)] = (weakref.ref(df), ids)
+    return ids
+
+
+def page_preview(df, rows=DEFAULT_PAGE_SIZE):
+    """
+    First `rows` rows without the lazy long-text columns: a cheap,
+    widget-free view for tables redrawn many times (e.g. while results stream in).
+    """
+    return df.iloc[:rows].drop(columns=[c for c in LAZY_COLUMNS if c in df.columns])
+
+
+# =========================================================
+# COMPONENT
+# =========================================================
+def paged_table(df, key, selectable=False, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Renders `df` one page at a time: only the visible rows and columns are
+    serialized to the browser, and long text columns are fetched for one
+    paper on demand. With `selectable`, a checkbox column tracks the
+    selection by stable paper ID across pages, sorting and filtering.
+
+    Returns the set of selected paper IDs (empty when not selectable).
+    """
+    selected_key = f"{key}_selected"
+    if selected_key not in st.session_state:
+        st.session_state[selected_key] = set()
+    selected = st.session_state[selected_key]
+
+    if df.empty:
+        st.info("No papers to show.")
+        return selected
+
+    ids = cached_paper_ids(df)
+    lazy = [c for c in LAZY_COLUMNS if c in df.columns]
+    all_columns = [c for c in df.columns if c not in lazy]
+
+    # ---------------- Controls ----------------
+    col1, col2, col3 = st.columns([1, 1, 4])
+    with col1:
+        size = st.selectbox(
+            "Rows per page",
+            PAGE_SIZES,
+            index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 0,
+            key=f"{key}_page_size",
+        )
+    pages = max(1, math.ceil(len(df) / size))
+    # The result set may have shrunk since the page was chosen
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key=f"{key}_page")
+    with col3:
+        columns = st.multiselect("Columns", all_columns, default=all_columns, key=f"{key}_columns")
+
+    start = (int(page) - 1) * size
+    page_rows = df.iloc[start:start + size]
+    page_ids = ids.iloc[start:start + size].tolist()
+    view = page_rows[columns or all_columns].reset_index(drop=True)
+
+    st.caption(f"Rows {start + 1}–{start + len(page_rows)} of {len(df)} · page {int(page)} of {pages}")
+
+    # ---------------- Grid ----------------
+    if selectable:
+        view.insert(0, SELECT_COLUMN, [pid in selected for pid in page_ids])
+        edited = st.data_editor(
+            view,
+            use_container_width=True,
+            hide_index=True,
+            disabled=[c for c in view.columns if c != SELECT_COLUMN],
+            column_config={SELECT_COLUMN: st.column_config.CheckboxColumn(SELECT_COLUMN, width="small")},
+            # Keyed by the rows shown: pending edits never carry over to other papers
+            key=f"{key}_editor_{hash(tuple(page_ids))}",
+        )
+        for pid, checked in zip(page_ids, edited[SELECT_COLUMN].tolist()):
+            if checked:
+                selected.add(pid)
+            else:
+                selected.discard(pid)
+
+        if selected and st.button(f"Clear selection ({len(selected)})", key=f"{key}_clear"):
+            selected.clear()
+            # Drop the editors' pending edits too, or they would re-check the boxes
+            for state_key in [k for k in st.session_state if str(k).startswith(f"{key}_editor_")]:
+                del st.session_state[state_key]
+            st.rerun()
+    else:
+        st.dataframe(view, use_container_width=True, hide_index=True)
+
+    # ---------------- Lazy long text ----------------
+    if lazy and "Paper Title" in df.columns:
+        titles = page_rows["Paper Title"].fillna("(untitled)").astype(str).tolist()
+        choice = st.selectbox(
+            "Show abstract for",
+            [None] + list(range(len(titles))),
+            format_func=lambda i: "—" if i is None else titles[i],
+            key=f"{key}_expand_{hash(tuple(page_ids))}",
+        )
+        if choice is not None:
+            for column in lazy:
+                value = page_rows[column].iloc[choice]
+                st.markdown(f"**{column}**")
+                st.write(value if isinstance(value, str) and value else "Not available.")
+
+    return selected
+
+
+def selected_rows(df, selected):
+    """Rows of `df` whose stable paper ID is in `selected`, in df order."""
+    if not selected or df.empty:
+        return df.iloc[0:0]
+    return df[cached_paper_ids(df).isin(selected).to_numpy()].reset_index(drop=True)
@@ -0,0 +1,177 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.dedup import record_identifiers
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+# Point this at a shared directory to share downloads between analysts
+DEFAULT_STORE_DIR = os.path.join("outputs", "pdf_store")
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def url_key(url):
+    if not url or not isinstance(url, str):
+        return None
+    return url.strip().split("#")[0] or None
+
+
+def pdf_keys(record, resolved_url=None):
+    """
+    Manifest keys for one paper: its identifiers (DOI, arXiv ID, ...) plus
+    the link it was requested from and the URL the PDF was finally served at.
+    """
+    keys = record_identifiers(record)
+    for url in (record.get("PDF Link"), resolved_url):
+        value = url_key(url)
+        if value:
+            keys.append(("url", value))
+    return list(dict.fromkeys(keys))
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PdfStore:
+    """
+    Content-addressed store for downloaded PDFs.
+
+    Each PDF is kept once under blobs/<aa>/<sha256>.pdf, whatever its
+    title. A SQLite manifest maps DOI / arXiv ID / URL keys to the blob,
+    so a paper already fetched (by anyone sharing the directory) is found
+    without touching the network.
+    """
+
+    def __init__(self, root=DEFAULT_STORE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._conn = None
+        self._claims = {}
+
+    # -----------------------------
+    # Storage
+    # -----------------------------
+    def _connect(self):
+        if self._conn is None:
+            os.makedirs(self.root, exist_ok=True)
+            conn = sqlite3.connect(os.path.join(self.root, "manifest.sqlite"), check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS blobs (
+                    sha256 TEXT PRIMARY KEY,
+                    size INTEGER,
+                    created_at REAL
+                );
+
+                CREATE TABLE IF NOT EXISTS pdf_keys (
+                    namespace TEXT,
+                    value TEXT,
+                    sha256 TEXT,
+                    updated_at REAL,
+                    PRIMARY KEY (namespace, value)
+                );
+                CREATE INDEX IF NOT EXISTS idx_pdf_keys_sha ON pdf_keys(sha256);
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def blob_path(self, sha256):
+        return os.path.join(self.root, "blobs", sha256[:2], sha256 + ".pdf")
+
+    def staging_path(self, url):
+        """Where an in-progress download of `url` lives until it is added."""
+        directory = os.path.join(self.root, "tmp")
+        os.makedirs(directory, exist_ok=True)
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(directory, name + ".pdf")
+
+    @contextmanager
+    def claim(self, url):
+        """
+        Staging path for `url`, held by one thread at a time so duplicate
+        rows never write, resume or rename the same .part concurrently.
+        """
+        path = self.staging_path(url)
+        with self._lock:
+            lock = self._claims.setdefault(path, threading.Lock())
+        with lock:
+            yield path
+
+    # -----------------------------
+    # Manifest
+    # -----------------------------
+    def lookup(self, keys):
+        """Hash of the stored PDF for the first known key, or None."""
+        with self._lock:
+            conn = self._connect()
+            for namespace, value in keys:
+                row = conn.execute(
+                    "SELECT sha256 FROM pdf_keys WHERE namespace = ? AND value = ?",
+                    (namespace, value),
+                ).fetchone()
+                # A blob removed by hand is fetched again
+                if row and os.path.exists(self.blob_path(row[0])):
+                    return row[0]
+        return None
+
+    def link(self, keys, sha256):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO pdf_keys (namespace, value, sha256, updated_at) VALUES (?, ?, ?, ?)",
+                [(namespace, value, sha256, now) for namespace, value in keys],
+            )
+            conn.commit()
+
+    def add(self, path, keys):
+        """
+        Moves the finished file at `path` into the store and records
+        `keys` for it. Returns its SHA-256.
+        """
+        sha256 = file_sha256(path)
+        target = self.blob_path(sha256)
+        if os.path.exists(target):
+            os.remove(path)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(path, target)
+
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR IGNORE INTO blobs (sha256, size, created_at) VALUES (?, ?, ?)",
+                (sha256, os.path.getsize(target), time.time()),
+            )
+            conn.commit()
+        self.link(keys, sha256)
+        return sha256
+
+    def read(self, sha256):
+        with open(self.blob_path(sha256), "rb") as f:
+            return f.read()
+
+    def stats(self):
+        with self._lock:
+            conn = self._connect()
+            blobs, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+            keys = conn.execute("SELECT COUNT(*) FROM pdf_keys").fetchone()[0]
+        return {"pdfs": blobs, "bytes": size, "keys": keys}
+
+
+# Process-wide store used by step 3 (writes) and step 4 (reads)
+PDF_STORE = PdfStore()
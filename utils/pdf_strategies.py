@@ -0,0 +1,238 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+import pandas as pd
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+DEFAULT_STRATEGY_PATH = os.path.join("outputs", "cache", "pdf_strategies.sqlite")
+
+# Known landing page -> PDF URL patterns: (name, pattern, replacement)
+URL_REWRITE_RULES = [
+    ("arxiv", r"^(https?://(?:www\.|export\.)?arxiv\.org)/abs/([^?#]+)$", r"\1/pdf/\2"),
+    ("openreview", r"^(https?://openreview\.net)/forum\?id=([^&#]+)$", r"\1/pdf?id=\2"),
+    ("acl_anthology", r"^(https?://aclanthology\.org/[^/?#]+?)/?$(?<!\.pdf)", r"\1.pdf"),
+    ("pmc", r"^(https?://(?:www\.)?ncbi\.nlm\.nih\.gov/pmc/articles/PMC\d+)/?$", r"\1/pdf/"),
+    ("biorxiv", r"^(https?://(?:www\.)?(?:bio|med)rxiv\.org/content/[^?#]+?)(?:\.full)?$(?<!\.pdf)", r"\1.full.pdf"),
+    ("springer", r"^(https?://link\.springer\.com)/(?:article|chapter)/(10\.[^?#]+)$", r"\1/content/pdf/\2.pdf"),
+    ("nature", r"^(https?://(?:www\.)?nature\.com/articles/[^/?#.]+)$", r"\1.pdf"),
+    ("mdpi", r"^(https?://(?:www\.)?mdpi\.com/[^?#]+)/htm$", r"\1/pdf"),
+    # Wiley, Taylor & Francis, SAGE, ACM, ACS ...
+    ("doi_pdf", r"^(https?://[^/]+)/doi/(?:abs|full|epdf)/(10\.[^?#]+)$", r"\1/doi/pdf/\2"),
+]
+
+# Ways of finding the PDF link in a landing page, cheapest first
+HTML_STRATEGIES = ("meta", "links", "regex")
+
+# A rewrite is tried while it has fewer than MIN_TRIALS outcomes for the
+# domain, then only while it keeps succeeding at least MIN_SUCCESS_RATE
+MIN_TRIALS = 3
+MIN_SUCCESS_RATE = 0.5
+# Extra requests spent on rewritten URLs before the link itself is fetched
+MAX_REWRITE_ATTEMPTS = 1
+
+
+def url_domain(url):
+    return urlsplit(url).netloc.lower() if isinstance(url, str) else ""
+
+
+# =========================================================
+# LEARNED REWRITES
+# =========================================================
+# A learned rewrite is stored as a strategy name, "learned:<json rule>",
+# inferred from a landing URL and the PDF URL found on that page:
+#   ["append", dir, suffix]            /articles/x        -> /articles/x.pdf
+#   ["insert", prefix, segment]        /doi/10.1/x        -> /doi/pdf/10.1/x
+#   ["replace", prefix, old, new]      /article/abs/123   -> /article/pdf/123
+# `dir` / `prefix` are the path segments that must match for the rule to apply.
+def learn_rewrite(landing_url, pdf_url):
+    """Strategy name of a rewrite that turns `landing_url` into `pdf_url`, or None."""
+    landing, pdf = urlsplit(landing_url), urlsplit(pdf_url)
+    if landing.netloc.lower() != pdf.netloc.lower() or landing.query != pdf.query:
+        return None
+
+    old, new = landing.path.split("/"), pdf.path.split("/")
+    rule = None
+    if len(new) == len(old) and new[:-1] == old[:-1] and new[-1].startswith(old[-1]) and new[-1] != old[-1]:
+        rule = ["append", old[:-1], new[-1][len(old[-1]):]]
+    elif len(new) == len(old) + 1:
+        for i in range(len(old)):
+            if new[:i] == old[:i] and new[i + 1:] == old[i:]:
+                rule = ["insert", old[:i], new[i]]
+                break
+    elif len(new) == len(old):
+        diff = [i for i in range(len(old)) if old[i] != new[i]]
+        if len(diff) == 1 and diff[0] < len(old) - 1:
+            i = diff[0]
+            rule = ["replace", old[:i], old[i], new[i]]
+
+    return "learned:" + json.dumps(rule) if rule else None
+
+
+def apply_rewrite(strategy, url):
+    """The URL `strategy` (rule:<name> or learned:<rule>) rewrites `url` to, or None."""
+    if strategy.startswith("rule:"):
+        for name, pattern, replacement in URL_REWRITE_RULES:
+            if "rule:" + name == strategy and re.match(pattern, url):
+                return re.sub(pattern, replacement, url)
+        return None
+
+    if not strategy.startswith("learned:"):
+        return None
+    kind, prefix, *args = json.loads(strategy[len("learned:"):])
+    parts = urlsplit(url)
+    path = parts.path.split("/")
+
+    if kind == "append":
+        if path[:-1] != prefix or not path[-1] or path[-1].endswith(args[0]):
+            return None
+        path = path[:-1] + [path[-1] + args[0]]
+    elif kind == "insert":
+        if path[:len(prefix)] != prefix or len(path) <= len(prefix):
+            return None
+        path = prefix + [args[0]] + path[len(prefix):]
+    elif kind == "replace":
+        i = len(prefix)
+        if path[:i] != prefix or len(path) <= i + 1 or path[i] != args[0]:
+            return None
+        path = prefix + [args[1]] + path[i + 1:]
+    else:
+        return None
+    return urlunsplit(parts._replace(path="/".join(path)))
+
+
+# =========================================================
+# STRATEGY TABLE
+# =========================================================
+class StrategyTable:
+    """
+    Per-domain success/failure counts for every way of resolving a PDF:
+    URL rewrites (built-in rules and rewrites learned from earlier
+    downloads), the direct link, and the HTML extraction modes. Persisted
+    in SQLite so what worked for a publisher is reused on later runs.
+    """
+
+    def __init__(self, path=DEFAULT_STRATEGY_PATH, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn = None
+
+    # -----------------------------
+    # Storage
+    # -----------------------------
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS strategies (
+                    domain TEXT,
+                    strategy TEXT,
+                    successes INTEGER,
+                    failures INTEGER,
+                    updated_at REAL,
+                    PRIMARY KEY (domain, strategy)
+                )
+                """
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def record(self, domain, strategy, success):
+        if not self.enabled or not domain:
+            return
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                """
+                INSERT INTO strategies (domain, strategy, successes, failures, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (domain, strategy) DO UPDATE SET
+                    successes = successes + excluded.successes,
+                    failures = failures + excluded.failures,
+                    updated_at = excluded.updated_at
+                """,
+                (domain, strategy, int(success), int(not success), time.time()),
+            )
+            conn.commit()
+
+    def domain_stats(self, domain):
+        """{strategy: (successes, failures)} for one domain."""
+        if not self.enabled or not domain:
+            return {}
+        with self._lock:
+            conn = self._connect()
+            rows = conn.execute(
+                "SELECT strategy, successes, failures FROM strategies WHERE domain = ?", (domain,)
+            ).fetchall()
+        return {strategy: (ok, failed) for strategy, ok, failed in rows}
+
+    def frame(self):
+        with self._lock:
+            conn = self._connect()
+            return pd.read_sql_query(
+                "SELECT domain, strategy, successes, failures FROM strategies ORDER BY domain, successes DESC",
+                conn,
+            )
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM strategies")
+            conn.commit()
+
+    # -----------------------------
+    # Planning
+    # -----------------------------
+    @staticmethod
+    def _success_rate(counts):
+        ok, failed = counts
+        return ok / (ok + failed) if ok + failed else 0.0
+
+    def rewrite_plan(self, url):
+        """
+        [(strategy, rewritten url)] worth requesting before `url` itself,
+        best record for the domain first. Rewrites that keep failing for
+        the domain are dropped once they have MIN_TRIALS outcomes.
+        """
+        if not isinstance(url, str):
+            return []
+        stats = self.domain_stats(url_domain(url))
+        names = ["rule:" + name for name, _, _ in URL_REWRITE_RULES]
+        names += [s for s in stats if s.startswith("learned:")]
+
+        plan, seen = [], {url}
+        for strategy in names:
+            target = apply_rewrite(strategy, url)
+            if not target or target in seen:
+                continue
+            counts = stats.get(strategy, (0, 0))
+            if sum(counts) >= MIN_TRIALS and self._success_rate(counts) < MIN_SUCCESS_RATE:
+                continue
+            seen.add(target)
+            plan.append((strategy, target, counts))
+
+        plan.sort(key=lambda item: (-self._success_rate(item[2]), -item[2][0]))
+        return [(strategy, target) for strategy, target, _ in plan[:MAX_REWRITE_ATTEMPTS]]
+
+    def html_order(self, domain):
+        """HTML extraction modes, the ones that worked for `domain` first."""
+        stats = self.domain_stats(domain)
+        return sorted(HTML_STRATEGIES, key=lambda mode: -stats.get(mode, (0, 0))[0])
+
+
+# Process-wide table updated by every step 3 download
+PDF_STRATEGIES = StrategyTable()
@@ -0,0 +1,198 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+# Seconds between requests per host (1 / steady-state rate)
+HOST_MIN_INTERVALS = {
+    "api.semanticscholar.org": 1.0,
+    "api.openalex.org": 1.0,
+    "export.arxiv.org": 3.0,
+}
+DEFAULT_MIN_INTERVAL = 1.5
+DEFAULT_BURST = 1
+
+BACKOFF_BASE = 2.0
+MAX_BACKOFF = 60.0
+THROTTLE_STATUSES = (429, 503)
+
+
+def _host(url):
+    return urlsplit(url).netloc.lower()
+
+
+def parse_retry_after(value, now=None):
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when - (now or time.time()))
+
+
+def _header(headers, *names):
+    for name in names:
+        value = headers.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+# =========================================================
+# PER-HOST BUCKET
+# =========================================================
+class HostBucket:
+    """
+    Token bucket in GCRA form: `tat` is the theoretical arrival time of the
+    next request, so reservations are O(1) and safe to hand out to many
+    threads at once. `paused_until` holds server-imposed pauses.
+    """
+
+    def __init__(self, interval, burst=DEFAULT_BURST):
+        self.interval = interval
+        self.burst = burst
+        self.tat = 0.0
+        self.paused_until = 0.0
+        self.strikes = 0
+
+        self.requests = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.throttled = 0
+        self.server_pauses = 0
+
+    def reserve(self, now, interval=None):
+        interval = interval or self.interval
+        start = max(now, self.paused_until)
+        tat = max(self.tat, start)
+        allowed_at = max(start, tat - (self.burst - 1) * interval)
+        self.tat = tat + interval
+        return allowed_at - now
+
+    def pause(self, seconds, now):
+        seconds = min(MAX_BACKOFF, max(0.0, seconds))
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.server_pauses += 1
+
+    def as_dict(self):
+        return {
+            "requests": self.requests,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "throttled": self.throttled,
+            "server_pauses": self.server_pauses,
+            "interval_s": round(self.interval, 3),
+        }
+
+
+# =========================================================
+# LIMITER
+# =========================================================
+class HostRateLimiter:
+    """
+    Per-host rate limiter shared by every network call in steps 1 and 3.
+
+    acquire() blocks until the host's bucket allows a request. observe()
+    adapts to the response: Retry-After and X-RateLimit-* headers pause or
+    slow the host, a 429 / 503 without hints triggers bounded exponential
+    backoff, and a success clears the backoff.
+    """
+
+    def __init__(self, host_intervals=None, default_interval=DEFAULT_MIN_INTERVAL):
+        self.host_intervals = dict(HOST_MIN_INTERVALS if host_intervals is None else host_intervals)
+        self.default_interval = default_interval
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host):
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            interval = self.host_intervals.get(host, self.default_interval)
+            bucket = self._buckets[host] = HostBucket(interval)
+        return bucket
+
+    def acquire(self, url, min_interval=None):
+        host = _host(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            interval = max(bucket.interval, min_interval or 0.0)
+            delay = bucket.reserve(time.monotonic(), interval)
+            bucket.requests += 1
+            if delay > 0:
+                bucket.waits += 1
+                bucket.wait_seconds += delay
+
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def observe(self, url, status, headers):
+        """Feed a response back; returns True when the caller should retry."""
+        host = _host(url)
+        now = time.monotonic()
+        headers = headers or {}
+
+        retry_after = parse_retry_after(_header(headers, "Retry-After"))
+        remaining = _header(headers, "X-RateLimit-Remaining", "RateLimit-Remaining")
+        reset = _header(headers, "X-RateLimit-Reset", "RateLimit-Reset")
+
+        with self._lock:
+            bucket = self._bucket(host)
+
+            reset_in = None
+            if reset is not None:
+                try:
+                    reset_value = float(reset)
+                    # Some APIs send an epoch timestamp, others a delta
+                    reset_in = reset_value - time.time() if reset_value > 1e9 else reset_value
+                except ValueError:
+                    reset_in = None
+
+            if remaining is not None and reset_in is not None and reset_in > 0:
+                try:
+                    left = int(float(remaining))
+                except ValueError:
+                    left = None
+                if left is not None and left <= 0:
+                    bucket.pause(reset_in, now)
+                elif left:
+                    # Spread what is left of the window evenly
+                    base = self.host_intervals.get(host, self.default_interval)
+                    bucket.interval = max(base, min(MAX_BACKOFF, reset_in / left))
+
+            if status in THROTTLE_STATUSES:
+                bucket.throttled += 1
+                bucket.strikes += 1
+                if retry_after is not None:
+                    bucket.pause(retry_after, now)
+                else:
+                    bucket.pause(BACKOFF_BASE * 2 ** (bucket.strikes - 1), now)
+                return True
+
+            if retry_after is not None:
+                bucket.pause(retry_after, now)
+
+            if status is not None and status < 400:
+                bucket.strikes = 0
+
+        return False
+
+    def stats(self):
+        with self._lock:
+            return {host: b.as_dict() for host, b in self._buckets.items()}
+
+    def total_wait_seconds(self):
+        with self._lock:
+            return sum(b.wait_seconds for b in self._buckets.values())
+
+
+RATE_LIMITER = HostRateLimiter()
@@ -0,0 +1,122 @@
+import pandas as pd
+
+
+# =========================================================
+# SCHEMA
+# =========================================================
+# (attribute, column name, dtype) in output column order
+SCHEMA = [
+    ("title", "Paper Title", object),
+    ("link", "Paper Link", object),
+    ("year", "Publication Year", "Int64"),
+    ("pub_type", "Publication Type", "category"),
+    ("venue", "Publication Title", object),
+    ("authors", "Author Names", object),
+    ("doi", "DOI", object),
+    ("pdf_link", "PDF Link", object),
+    ("open_access", "Open Access", "boolean"),
+    ("citations", "Citations Count", "Int64"),
+    ("pubmed_id", "PubMed ID", object),
+    ("pmc_id", "PMC ID", object),
+    ("references", "References", "Int64"),
+    ("arxiv_id", "arXiv ID", object),
+    ("s2_id", "Semantic Scholar ID", object),
+    ("openalex_id", "OpenAlex ID", object),
+    ("categories", "Categories", object),
+    ("source", "Source", "category"),
+    ("abstract", "Abstract", object),
+    ("review", "Review", "category"),
+    ("preprint", "Preprint", "category"),
+    ("arxiv_used", "arXiv_used", "category"),
+    ("matched_queries", "Matched Queries", object),
+]
+
+ATTRIBUTES = tuple(attr for attr, _, _ in SCHEMA)
+COLUMNS = tuple(col for _, col, _ in SCHEMA)
+COLUMN_TO_ATTR = {col: attr for attr, col, _ in SCHEMA}
+DTYPES = {col: dtype for _, col, dtype in SCHEMA}
+
+
+# =========================================================
+# RECORD
+# =========================================================
+class PaperRecord:
+    """
+    Compact per-paper record built by the search providers.
+
+    Uses __slots__ instead of a 20-odd key dict per paper. Column-name
+    access (record["DOI"], .get, .items) is kept so merge / dedup code can
+    treat records and plain dicts alike.
+    """
+
+    __slots__ = ATTRIBUTES
+
+    def __init__(self, **values):
+        for attr in ATTRIBUTES:
+            setattr(self, attr, values.pop(attr, None))
+        if values:
+            raise TypeError(f"Unknown record fields: {', '.join(values)}")
+
+    @classmethod
+    def from_dict(cls, row):
+        record = cls()
+        for col, value in row.items():
+            attr = COLUMN_TO_ATTR.get(col)
+            if attr is not None:
+                setattr(record, attr, None if _is_missing(value) else value)
+        return record
+
+    def __getitem__(self, column):
+        return getattr(self, COLUMN_TO_ATTR[column])
+
+    def __setitem__(self, column, value):
+        setattr(self, COLUMN_TO_ATTR[column], value)
+
+    def get(self, column, default=None):
+        attr = COLUMN_TO_ATTR.get(column)
+        if attr is None:
+            return default
+        return getattr(self, attr)
+
+    def keys(self):
+        return COLUMNS
+
+    def items(self):
+        return [(col, getattr(self, attr)) for attr, col, _ in SCHEMA]
+
+    def copy(self):
+        clone = PaperRecord.__new__(PaperRecord)
+        for attr in ATTRIBUTES:
+            setattr(clone, attr, getattr(self, attr))
+        return clone
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"PaperRecord(title={self.title!r}, source={self.source!r})"
+
+
+def _is_missing(value):
+    try:
+        return value is None or bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+# =========================================================
+# DATAFRAME
+# =========================================================
+def records_to_dataframe(records):
+    """
+    Build the results DataFrame column by column with explicit dtypes
+    instead of letting pandas infer object columns from dicts.
+    """
+    records = list(records)
+    data = {}
+
+    for _, col, dtype in SCHEMA:
+        values = pd.Series([r.get(col) for r in records], dtype=object)
+        data[col] = values if dtype is object else values.astype(dtype)
+
+    return pd.DataFrame(data)
@@ -0,0 +1,117 @@
+import re
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# Titles are short and on-point; count them this many times against the abstract
+TITLE_WEIGHT = 2
+
+# Blend of the final "Rank Score"
+RELEVANCE_WEIGHT = 0.6
+CITATION_WEIGHT = 0.25
+RECENCY_WEIGHT = 0.15
+RECENCY_HALF_LIFE_YEARS = 5
+
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "by", "for", "from", "in", "into",
+    "is", "of", "on", "or", "the", "to", "via", "with",
+}
+
+
+def query_terms(query):
+    words = re.findall(r"\w+", (query or "").lower())
+    return list(dict.fromkeys(w for w in words if w not in STOP_WORDS))
+
+
+def document_texts(df):
+    title = df["Paper Title"].fillna("").astype(str) if "Paper Title" in df.columns else pd.Series("", index=df.index)
+    abstract = df["Abstract"].fillna("").astype(str) if "Abstract" in df.columns else pd.Series("", index=df.index)
+    return ((title + " ") * TITLE_WEIGHT + abstract).str.lower()
+
+
+# =========================================================
+# BM25
+# =========================================================
+def bm25_scores(texts, query, k1=BM25_K1, b=BM25_B):
+    """
+    Okapi BM25 of every text against `query`, as a float array.
+
+    Only query terms are ever counted: one combined regex pass finds the
+    documents that mention any term, term frequencies are counted on that
+    subset, and the scoring itself is a handful of NumPy array ops.
+    Document length is measured in characters, which keeps the length
+    normalization without tokenizing every abstract.
+    """
+    texts = texts.reset_index(drop=True)
+    n = len(texts)
+    scores = np.zeros(n)
+    terms = query_terms(query)
+    if n == 0 or not terms:
+        return scores
+
+    lengths = texts.str.len().to_numpy(dtype=float)
+    avg_length = lengths.mean() or 1.0
+
+    patterns = [rf"\b{re.escape(t)}\b" for t in terms]
+    hit_mask = texts.str.contains("|".join(patterns), regex=True).to_numpy()
+    hits = np.flatnonzero(hit_mask)
+    if hits.size == 0:
+        return scores
+
+    subset = texts.iloc[hits]
+    norm = k1 * (1 - b + b * lengths[hits] / avg_length)
+    for pattern in patterns:
+        tf = subset.str.count(pattern).to_numpy(dtype=float)
+        df_t = np.count_nonzero(tf)
+        if df_t == 0:
+            continue
+        idf = np.log(1 + (n - df_t + 0.5) / (df_t + 0.5))
+        scores[hits] += idf * tf * (k1 + 1) / (tf + norm)
+    return scores
+
+
+# =========================================================
+# BLENDED RANKING
+# =========================================================
+def rank_by_relevance(df, query, current_year=None):
+    """
+    Adds "Relevance" (BM25 scaled to 0..1), and "Rank Score" blending it
+    with log-scaled citations and an exponential recency decay, then
+    sorts by "Rank Score".
+    """
+    df = df.copy()
+    if df.empty:
+        df["Relevance"] = pd.Series(dtype=float)
+        df["Rank Score"] = pd.Series(dtype=float)
+        return df
+
+    current_year = current_year or datetime.now().year
+
+    bm25 = bm25_scores(document_texts(df), query)
+    relevance = bm25 / bm25.max() if bm25.max() > 0 else bm25
+
+    missing = pd.Series(np.nan, index=df.index)
+    citations = pd.to_numeric(df.get("Citations Count", missing), errors="coerce").fillna(0).clip(lower=0).to_numpy(dtype=float)
+    citation_score = np.log1p(citations)
+    if citation_score.max() > 0:
+        citation_score /= citation_score.max()
+
+    years = pd.to_numeric(df.get("Publication Year", missing), errors="coerce").astype(float).to_numpy()
+    age = np.clip(current_year - years, 0, None)
+    recency = np.nan_to_num(0.5 ** (age / RECENCY_HALF_LIFE_YEARS), nan=0.0)
+
+    df["Relevance"] = relevance.round(4)
+    df["Rank Score"] = (
+        RELEVANCE_WEIGHT * relevance
+        + CITATION_WEIGHT * citation_score
+        + RECENCY_WEIGHT * recency
+    ).round(4)
+    return df.sort_values("Rank Score", ascending=False, kind="stable").reset_index(drop=True)
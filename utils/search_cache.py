@@ -0,0 +1,235 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+DEFAULT_CACHE_PATH = os.path.join("outputs", "cache", "search_cache.sqlite")
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_LOOKUP_CACHE_PATH = os.path.join("outputs", "cache", "lookup_cache.sqlite")
+DEFAULT_LOOKUP_MAX_ENTRIES = 200_000
+# Expired pages are swept, and the running size totals re-read from the
+# table, at most this often rather than on every write
+SWEEP_INTERVAL_SECONDS = 60
+
+
+def make_cache_key(provider, url, params):
+    """
+    Stable key over provider + endpoint + every request parameter
+    (query, offset / cursor, field list, filters ...).
+    """
+    payload = json.dumps(
+        {"provider": provider, "url": url, "params": params or {}},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """
+    On-disk cache for raw provider response pages.
+
+    Entries expire after `ttl` seconds. When the cache grows past
+    `max_entries` or `max_bytes`, the least recently used pages are evicted.
+    Entry count and size are kept as running totals, so a write costs no
+    table scan; get_many / set_many handle a whole batch in one transaction.
+    """
+
+    def __init__(
+        self,
+        path=DEFAULT_CACHE_PATH,
+        ttl=DEFAULT_TTL_SECONDS,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        max_bytes=DEFAULT_MAX_BYTES,
+        enabled=True,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._entries = 0
+        self._bytes = 0
+        self._swept_at = None
+
+    # -----------------------------
+    # Storage
+    # -----------------------------
+    def _connect(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS pages (
+                    key TEXT PRIMARY KEY,
+                    provider TEXT,
+                    body TEXT,
+                    size INTEGER,
+                    created_at REAL,
+                    accessed_at REAL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages(accessed_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+    def get(self, provider, url, params):
+        return self.get_many(provider, url, [params])[0]
+
+    def set(self, provider, url, params, body):
+        self.set_many(provider, url, [(params, body)])
+
+    def get_many(self, provider, url, params_list):
+        """Cached bodies for each params dict (None when missing), in order."""
+        if not self.enabled:
+            return [None] * len(params_list)
+
+        keys = [make_cache_key(provider, url, params) for params in params_list]
+        now = time.time()
+        bodies, touched, expired = [], [], []
+
+        with self._lock:
+            conn = self._connect()
+            for key in keys:
+                row = conn.execute(
+                    "SELECT body, size, created_at FROM pages WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    bodies.append(None)
+                    continue
+
+                body, size, created_at = row
+                if self.ttl is not None and now - created_at > self.ttl:
+                    expired.append((key,))
+                    self._entries -= 1
+                    self._bytes -= size
+                    bodies.append(None)
+                    continue
+
+                touched.append((now, key))
+                bodies.append(body)
+
+            if expired:
+                conn.executemany("DELETE FROM pages WHERE key = ?", expired)
+            if touched:
+                conn.executemany("UPDATE pages SET accessed_at = ? WHERE key = ?", touched)
+            if expired or touched:
+                conn.commit()
+            self.hits += len(touched)
+            self.misses += len(bodies) - len(touched)
+        return bodies
+
+    def set_many(self, provider, url, items):
+        """Stores (params, body) pairs in one transaction and evicts once."""
+        items = [(params, body) for params, body in items if body is not None]
+        if not self.enabled or not items:
+            return
+
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            for params, body in items:
+                key = make_cache_key(provider, url, params)
+                old = conn.execute("SELECT size FROM pages WHERE key = ?", (key,)).fetchone()
+                if old:
+                    self._entries -= 1
+                    self._bytes -= old[0]
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, provider, body, len(body), now, now),
+                )
+                self._entries += 1
+                self._bytes += len(body)
+            self._evict(conn)
+            conn.commit()
+
+    def clear(self):
+        with self._lock:
+            conn = self._connect()
+            conn.execute("DELETE FROM pages")
+            conn.commit()
+            self._entries = self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            conn = self._connect()
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    # -----------------------------
+    # Eviction
+    # -----------------------------
+    def _evict(self, conn):
+        now = time.time()
+        if self._swept_at is None or now - self._swept_at >= SWEEP_INTERVAL_SECONDS:
+            if self.ttl is not None:
+                cur = conn.execute(
+                    "DELETE FROM pages WHERE created_at < ?", (now - self.ttl,)
+                )
+                self.evictions += max(cur.rowcount, 0)
+            # Also picks up pages written by other processes sharing the file
+            self._entries, self._bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()
+            self._swept_at = now
+
+        entries, size = self._entries, self._bytes
+        if entries <= self.max_entries and size <= self.max_bytes:
+            return
+
+        # Walk from least recently used until both caps are satisfied
+        doomed = []
+        for key, row_size in conn.execute(
+            "SELECT key, size FROM pages ORDER BY accessed_at ASC"
+        ):
+            if entries <= self.max_entries and size <= self.max_bytes:
+                break
+            doomed.append((key,))
+            entries -= 1
+            size -= row_size
+
+        conn.executemany("DELETE FROM pages WHERE key = ?", doomed)
+        self.evictions += len(doomed)
+        self._entries, self._bytes = entries, size
+
+
+# Process-wide instance shared by every search provider
+SEARCH_CACHE = SearchCache()
+
+# Per-ID lookups (enrichment, snowballing) get their own file and LRU, so
+# a run over thousands of IDs never evicts the search pages
+LOOKUP_CACHE = SearchCache(path=DEFAULT_LOOKUP_CACHE_PATH, max_entries=DEFAULT_LOOKUP_MAX_ENTRIES)
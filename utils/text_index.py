@@ -0,0 +1,212 @@
+import bisect
+import re
+
+import numpy as np
+import pandas as pd
+
+
+# =========================================================
+# CONFIG
+# =========================================================
+INDEXED_COLUMNS = ["Paper Title", "Abstract", "Publication Title", "Author Names"]
+
+TOKEN_RE = re.compile(r"\w+")
+NON_WORD_RE = re.compile(r"\W+")
+
+# Bytes kept in tokens: ASCII letters/digits/underscore, the row separator
+# and every non-ASCII byte (so accented words stay whole); the rest is a space.
+# Non-ASCII rows have their Unicode punctuation and spaces (en dash, curly
+# quotes, NBSP ...) blanked with NON_WORD_RE first, so words split exactly
+# where TOKEN_RE splits queries
+_ROW_SEPARATOR = b"\x01"
+_TOKEN_BYTES = bytes(
+    c if chr(c).isalnum() or c == ord("_") or c == 1 or c >= 128 else ord(" ")
+    for c in range(256)
+)
+QUERY_TOKEN_RE = re.compile(r'"[^"]*"|\(|\)|-(?=\S)|[^\s()"]+')
+
+
+class QuerySyntaxError(ValueError):
+    pass
+
+
+# =========================================================
+# INDEX
+# =========================================================
+def tokenize_rows(texts):
+    """
+    Tokenizes every row in one pass: rows are joined with a separator
+    token, punctuation is mapped to spaces with bytes.translate and the
+    result split, which is far cheaper than a regex per row. Returns
+    (term codes, vocabulary as bytes, row of each token).
+    """
+    joined = (b" " + _ROW_SEPARATOR + b" ").join(
+        (t if t.isascii() else NON_WORD_RE.sub(" ", t)).encode("utf-8") for t in texts
+    )
+    tokens = np.array(joined.translate(_TOKEN_BYTES).split(), dtype=object)
+    if tokens.size == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=object), np.empty(0, dtype=np.int64)
+
+    codes, vocab = pd.factorize(tokens)
+    sep = pd.Index(vocab).get_indexer([_ROW_SEPARATOR])[0]
+    if sep < 0:
+        return codes, vocab, np.zeros(len(codes), dtype=np.int64)
+
+    # Drop the separator term and shift the codes above it down by one
+    is_separator = codes == sep
+    rows = np.cumsum(is_separator)[~is_separator]
+    codes = codes[~is_separator]
+    codes = codes - (codes > sep)
+    return codes, np.delete(vocab, sep), rows
+
+
+class InvertedIndex:
+    """
+    Term -> sorted row positions over the indexed text columns, stored as
+    one CSR-style postings array. Built once per result set; each query
+    is a few postings lookups combined as boolean masks.
+    """
+
+    def __init__(self, df, columns=INDEXED_COLUMNS):
+        self.size = len(df)
+        cols = [c for c in columns if c in df.columns]
+        if cols:
+            texts = df[cols[0]].fillna("").astype(str)
+            for col in cols[1:]:
+                texts = texts + " \n " + df[col].fillna("").astype(str)
+            self.texts = texts.str.lower().reset_index(drop=True)
+        else:
+            self.texts = pd.Series([""] * self.size, dtype=object)
+
+        codes, vocab, rows = tokenize_rows(self.texts)
+
+        # Unique (term, row) pairs, sorted by term then row
+        pairs = np.sort(codes.astype(np.int64) * max(self.size, 1) + rows)
+        if pairs.size:
+            pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+        term_of_pair = pairs // max(self.size, 1)
+        self.postings = pairs % max(self.size, 1)
+
+        # Terms re-ordered alphabetically so prefix queries are a bisect
+        vocab = np.array([v.decode("utf-8", "ignore") for v in vocab], dtype=object)
+        order = np.argsort(vocab)
+        self.terms = vocab[order].tolist()
+        counts = np.bincount(term_of_pair, minlength=len(vocab))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        self._starts = starts[order]
+        self._ends = self._starts + counts[order]
+
+    # -----------------------------
+    # Lookups
+    # -----------------------------
+    def rows(self, term):
+        i = bisect.bisect_left(self.terms, term)
+        if i < len(self.terms) and self.terms[i] == term:
+            return self.postings[self._starts[i]:self._ends[i]]
+        return np.empty(0, dtype=np.int64)
+
+    def prefix_rows(self, prefix):
+        lo = bisect.bisect_left(self.terms, prefix)
+        hi = bisect.bisect_left(self.terms, prefix + "￿")
+        if lo == hi:
+            return np.empty(0, dtype=np.int64)
+        return np.unique(np.concatenate([self.postings[self._starts[i]:self._ends[i]] for i in range(lo, hi)]))
+
+    def _mask(self, rows):
+        mask = np.zeros(self.size, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def term_mask(self, word):
+        word = word.lower()
+        if word.endswith("*"):
+            return self._mask(self.prefix_rows(word[:-1]))
+        words = TOKEN_RE.findall(word)
+        if not words:
+            return np.ones(self.size, dtype=bool)
+        mask = self._mask(self.rows(words[0]))
+        for w in words[1:]:
+            mask &= self._mask(self.rows(w))
+        return mask
+
+    def phrase_mask(self, phrase):
+        # Every word through the index, then the exact phrase on the survivors only
+        mask = self.term_mask(phrase)
+        words = TOKEN_RE.findall(phrase.lower())
+        if len(words) > 1:
+            candidates = np.flatnonzero(mask)
+            pattern = r"\b" + r"\W+".join(map(re.escape, words)) + r"\b"
+            hits = self.texts.iloc[candidates].str.contains(pattern, regex=True).to_numpy()
+            mask[candidates[~hits]] = False
+        return mask
+
+    # -----------------------------
+    # Boolean queries
+    # -----------------------------
+    def search(self, query):
+        """
+        Boolean mask of rows matching `query`. Words are ANDed by default;
+        supports OR, AND, NOT / -word, parentheses, "exact phrases" and
+        prefix* wildcards. Matching is case-insensitive.
+        """
+        tokens = QUERY_TOKEN_RE.findall(query or "")
+        if not tokens:
+            return np.ones(self.size, dtype=bool)
+        return _QueryParser(self, tokens).parse()
+
+
+class _QueryParser:
+    # expr := and_expr (OR and_expr)*
+    # and_expr := unary ((AND)? unary)*
+    # unary := (NOT | -) unary | "(" expr ")" | phrase | word
+
+    def __init__(self, index, tokens):
+        self.index = index
+        self.tokens = tokens
+        self.pos = 0
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self):
+        token = self._peek()
+        self.pos += 1
+        return token
+
+    def parse(self):
+        mask = self._expr()
+        if self._peek() is not None:
+            raise QuerySyntaxError(f"Unexpected '{self._peek()}'")
+        return mask
+
+    def _expr(self):
+        mask = self._and_expr()
+        while self._peek() == "OR":
+            self._next()
+            mask = mask | self._and_expr()
+        return mask
+
+    def _and_expr(self):
+        mask = self._unary()
+        while self._peek() not in (None, "OR", ")"):
+            if self._peek() == "AND":
+                self._next()
+            mask = mask & self._unary()
+        return mask
+
+    def _unary(self):
+        token = self._next()
+        if token is None:
+            raise QuerySyntaxError("Query ends early")
+        if token in ("NOT", "-"):
+            return ~self._unary()
+        if token == "(":
+            mask = self._expr()
+            if self._next() != ")":
+                raise QuerySyntaxError("Missing ')'")
+            return mask
+        if token in (")", "AND", "OR"):
+            raise QuerySyntaxError(f"Unexpected '{token}'")
+        if token.startswith('"'):
+            return self.index.phrase_mask(token.strip('"'))
+        return self.index.term_mask(token)